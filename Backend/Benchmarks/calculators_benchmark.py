@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Calculators'))
+
+import Calculators
+import Vectorized
+
+def scenario_grid(size, seed=0):
+    rng = np.random.default_rng(seed)
+    rates = np.linspace(-5, 15, size[0])[:, None, None]
+    years = np.arange(1, size[1] + 1)[None, :, None]
+    principals = rng.uniform(1_000, 100_000, size[2])[None, None, :]
+    return rates, years, principals
+
+def cases(size):
+    rates, years, principals = scenario_grid(size)
+    expiry = np.linspace(50, 150, size[0] * size[1] * size[2])
+    entries = np.linspace(90, 110, expiry.size)
+    stops = entries - np.linspace(-2, 10, expiry.size)
+
+    return [
+        ('calculate_compound_growth', (principals, rates, years, 12)),
+        ('calculate_future_value', (principals, rates, years)),
+        ('calculate_present_value', (principals, rates, years)),
+        ('calculate_cagr', (principals, principals * 2, years)),
+        ('calculate_option_profit_loss', ('call', 100.0, expiry, 4.5, 100, 1)),
+        ('calculate_position_size', (50_000.0, 1.0, entries, stops)),
+    ]
+
+def scalar_loop(name, args):
+    function = getattr(Calculators, name)
+    arrays = np.broadcast_arrays(*[np.asarray(arg, dtype=object) for arg in args])
+    return np.array([function(*values) for values in zip(*(array.ravel() for array in arrays))], dtype=float)
+
+def timed(function, *args, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the vectorized calculators against a scalar Python loop.")
+    parser.add_argument('--rates', type=int, default=50)
+    parser.add_argument('--years', type=int, default=40)
+    parser.add_argument('--principals', type=int, default=100)
+    args = parser.parse_args()
+
+    size = (args.rates, args.years, args.principals)
+    print(f"{size[0]} rates x {size[1]} years x {size[2]} principals = {np.prod(size):,} cells")
+    print(f"{'function':<32}{'loop (s)':>12}{'vectorized (s)':>16}{'speedup':>10}")
+    for name, call_args in cases(size):
+        loop_time, expected = timed(scalar_loop, name, call_args)
+        vector_time, result = timed(getattr(Vectorized, name), *call_args, repeat=5)
+        np.testing.assert_allclose(np.ravel(np.broadcast_to(result, np.broadcast_shapes(*[np.shape(a) for a in call_args]))), expected, rtol=1e-12)
+        print(f"{name:<32}{loop_time:>12.4f}{vector_time:>16.4f}{loop_time / vector_time:>9.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import datetime
+import gc
+import inspect
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Indicators'))
+
+import Indicators
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+# Committed reference run (sizes 1,000 / 100,000 / 1,000,000) for --baseline.
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indicators_baseline.json')
+
+# Public functions whose signature has no usable default for every argument.
+EXTRA_ARGUMENTS = {
+    'rolling_argmax': lambda data: ((data['high'], 26), {}),
+    'rolling_argmin': lambda data: ((data['low'], 26), {}),
+    'rolling_mean_absolute_deviation': lambda data: ((data['close'], 20), {}),
+}
+
+def make_ohlcv(n_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_bars)))
+    spread = close * rng.uniform(0.0005, 0.005, n_bars)
+    open_ = close + rng.normal(0, 0.5, n_bars) * spread
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 1_000_000, n_bars),
+    }, index=pd.date_range('2000-01-03 09:30', periods=n_bars, freq='min'))
+
+def indicator_functions():
+    return {
+        name: function
+        for name, function in inspect.getmembers(Indicators, inspect.isfunction)
+        if function.__module__ == Indicators.__name__ and not name.startswith('_')
+    }
+
+def call_arguments(name, data):
+    if name in EXTRA_ARGUMENTS:
+        return EXTRA_ARGUMENTS[name](data)
+    return (data,), {}
+
+def time_call(function, args, kwargs, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory(function, args, kwargs):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(sizes, names=None, repeat=3, budget=None):
+    functions = indicator_functions()
+    if names:
+        unknown = sorted(set(names) - set(functions))
+        if unknown:
+            raise SystemExit(f"Unknown indicator function(s): {', '.join(unknown)}")
+        functions = {name: functions[name] for name in names}
+
+    results = []
+    over_budget = set()
+    for bars in sorted(sizes):
+        data = make_ohlcv(bars)
+        for name, function in functions.items():
+            record = {'function': name, 'bars': bars}
+            if name in over_budget:
+                record['status'] = 'skipped'
+            else:
+                args, kwargs = call_arguments(name, data)
+                try:
+                    record['seconds'] = time_call(function, args, kwargs, repeat)
+                    record['peak_bytes'] = peak_memory(function, args, kwargs)
+                    record['status'] = 'ok'
+                except Exception as e:
+                    record['status'] = 'error'
+                    record['error'] = f"{type(e).__name__}: {e}"
+                if budget is not None and record.get('seconds', 0) > budget:
+                    over_budget.add(name)
+            results.append(record)
+            print(format_record(record), flush=True)
+        del data
+    return results
+
+def format_record(record):
+    line = f"{record['function']:<40}{record['bars']:>12,}"
+    if record['status'] == 'ok':
+        return line + f"{record['seconds']:>12.4f}s{record['peak_bytes'] / 2**20:>10.1f} MiB"
+    return line + f"  {record['status']}{': ' + record['error'] if 'error' in record else ''}"
+
+def environment():
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+def compare(results, baseline, threshold, min_seconds):
+    reference = {
+        (record['function'], record['bars']): record
+        for record in baseline['results'] if record.get('status') == 'ok'
+    }
+    # A case that ran in the baseline but errors or is skipped now is a
+    # regression too (reported with no ratio).
+    regressions = []
+    for record in results:
+        previous = reference.get((record['function'], record['bars']))
+        if previous is None:
+            continue
+        if record['status'] != 'ok':
+            regressions.append((record, previous, None))
+            continue
+        if record['seconds'] < min_seconds:
+            continue
+        ratio = record['seconds'] / previous['seconds']
+        if ratio > 1 + threshold:
+            regressions.append((record, previous, ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and profile every public function in Indicators.py on synthetic OHLCV data.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Bar counts to benchmark.')
+    parser.add_argument('--functions', nargs='+', help='Only benchmark these functions.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case; the best one is kept.')
+    parser.add_argument('--budget', type=float, help='Skip larger sizes for a function once a run takes longer than this many seconds.')
+    parser.add_argument('--output', default='indicators_benchmark.json', help='Where to write the results as JSON.')
+    parser.add_argument('--baseline', help=f'Baseline JSON to compare against (a reference run is committed at {os.path.basename(BASELINE_PATH)}).')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown over the baseline (0.25 = 25%%).')
+    parser.add_argument('--min-seconds', type=float, default=0.001, help='Ignore regressions on runs faster than this.')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.functions, args.repeat, args.budget)
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for record, previous, ratio in regressions:
+                if ratio is None:
+                    print(f"  {record['function']} @ {record['bars']:,} bars: {previous['seconds']:.4f}s -> {record['status']}"
+                          f"{': ' + record['error'] if 'error' in record else ''}")
+                else:
+                    print(f"  {record['function']} @ {record['bars']:,} bars: {previous['seconds']:.4f}s -> {record['seconds']:.4f}s ({ratio:.2f}x)")
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import io
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LLM'))
+
+import Batch
+import stub_server
+
+async def run(base_url, questions, concurrency, rate):
+    client = Batch.make_client(base_url, api_key='stub')
+    try:
+        return await Batch.run_batch(questions, client, io.StringIO(), concurrency=concurrency, rate=rate, base_delay=0.05)
+    finally:
+        await client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure LLM batch throughput and failure handling against the local stub server.")
+    parser.add_argument('--questions', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--rate', type=float, default=None, help='Token-bucket requests per second.')
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.05)
+    parser.add_argument('--error-rate', type=float, default=0.05)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = stub_server.serve(
+        port=args.port, latency=args.latency, jitter=args.latency / 4,
+        rate_limit_rate=args.rate_limit_rate, error_rate=args.error_rate, seed=0
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{args.port}/v1"
+    questions = [f"Question number {i}?" for i in range(args.questions)]
+
+    print(f"{'concurrency':>12}{'seconds':>10}{'q/s':>8}{'ok':>6}{'errors':>8}{'retries':>9}")
+    try:
+        for concurrency in args.concurrency:
+            stats = asyncio.run(run(base_url, questions, concurrency, args.rate))
+            print(f"{concurrency:>12}{stats['seconds']:>10.2f}{stats['questions'] / stats['seconds']:>8.1f}"
+                  f"{stats['ok']:>6}{stats['errors']:>8}{stats['retries']:>9}")
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'Forecasts'))
+sys.path.insert(0, os.path.join(HERE, '..', 'Data'))
+
+import Forecast
+from sklearn.preprocessing import MinMaxScaler
+from tensorflow.keras.layers import LSTM, Dense
+from tensorflow.keras.models import Sequential
+
+def make_prices(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_rows)))
+    return pd.DataFrame({'Close': close}, index=pd.bdate_range('2015-01-01', periods=n_rows, name='Date'))
+
+def legacy_lstm_training(data, look_back=60, epochs=5):
+    # The original pipeline: Python-built windows and batch_size=1.
+    close_data = data.filter(['Close']).values
+    scaled_data = MinMaxScaler(feature_range=(0, 1)).fit_transform(close_data)
+    train_data = scaled_data[0:math.ceil(len(close_data) * .8), :]
+
+    x_train, y_train = [], []
+    for i in range(look_back, len(train_data)):
+        x_train.append(train_data[i-look_back:i, 0])
+        y_train.append(train_data[i, 0])
+    x_train, y_train = np.array(x_train), np.array(y_train)
+    x_train = np.reshape(x_train, (x_train.shape[0], x_train.shape[1], 1))
+
+    model = Sequential([
+        LSTM(50, return_sequences=True, input_shape=(x_train.shape[1], 1)),
+        LSTM(50, return_sequences=False),
+        Dense(25),
+        Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mean_squared_error')
+    model.fit(x_train, y_train, batch_size=1, epochs=epochs, verbose=0)
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare LSTM training time per ticker: legacy batch_size=1 loop vs the batched tf.data pipeline.")
+    parser.add_argument('--rows', type=int, default=2_500, help='Daily bars per ticker (10 years is about 2,500).')
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[32, 64, 256])
+    parser.add_argument('--skip-legacy', action='store_true')
+    args = parser.parse_args()
+
+    data = make_prices(args.rows)
+    print(f"{'pipeline':<32}{'seconds':>10}")
+    legacy = None
+    if not args.skip_legacy:
+        legacy = timed(legacy_lstm_training, data, epochs=args.epochs)
+        print(f"{'legacy (batch_size=1)':<32}{legacy:>10.1f}")
+
+    for batch_size in args.batch_sizes:
+        # patience=epochs keeps early stopping from cutting the comparison short.
+        seconds = timed(Forecast.lstm_forecast, data, epochs=args.epochs, batch_size=batch_size, patience=args.epochs)
+        speedup = f"  ({legacy / seconds:.0f}x)" if legacy else ''
+        print(f"{f'tf.data batch_size={batch_size}':<32}{seconds:>10.1f}{speedup}")
+    print("\nNew-pipeline timings include held-out prediction and a 30-step recursive forecast.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Calculators'))
+
+import Options
+
+def make_chain(n_contracts, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'option_type': np.where(rng.random(n_contracts) < 0.5, 'call', 'put'),
+        'spot': 100.0,
+        'strike': rng.uniform(60, 140, n_contracts),
+        'time_to_expiry': rng.uniform(7 / 365, 2, n_contracts),
+        'rate': 0.04,
+        'volatility': rng.uniform(0.1, 0.8, n_contracts),
+        'dividend_yield': 0.01,
+    }
+
+def scalar_greeks(option_type, spot, strike, time_to_expiry, rate, volatility, dividend_yield):
+    cdf = lambda x: 0.5 * math.erfc(-x / math.sqrt(2))
+    pdf = lambda x: math.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+    sqrt_t = math.sqrt(time_to_expiry)
+    d1 = (math.log(spot / strike) + (rate - dividend_yield + 0.5 * volatility ** 2) * time_to_expiry) / (volatility * sqrt_t)
+    d2 = d1 - volatility * sqrt_t
+    sign = 1.0 if option_type == 'call' else -1.0
+    spot_discount = spot * math.exp(-dividend_yield * time_to_expiry)
+    strike_discount = strike * math.exp(-rate * time_to_expiry)
+    return {
+        'price': sign * (spot_discount * cdf(sign * d1) - strike_discount * cdf(sign * d2)),
+        'delta': sign * math.exp(-dividend_yield * time_to_expiry) * cdf(sign * d1),
+        'gamma': math.exp(-dividend_yield * time_to_expiry) * pdf(d1) / (spot * volatility * sqrt_t),
+        'vega': spot_discount * pdf(d1) * sqrt_t,
+        'theta': (-spot_discount * pdf(d1) * volatility / (2 * sqrt_t)
+                  - sign * rate * strike_discount * cdf(sign * d2)
+                  + sign * dividend_yield * spot_discount * cdf(sign * d1)),
+        'rho': sign * strike * time_to_expiry * math.exp(-rate * time_to_expiry) * cdf(sign * d2),
+    }
+
+def per_contract(chain):
+    return [
+        scalar_greeks(option_type, chain['spot'], strike, expiry, chain['rate'], volatility, chain['dividend_yield'])
+        for option_type, strike, expiry, volatility in zip(chain['option_type'], chain['strike'], chain['time_to_expiry'], chain['volatility'])
+    ]
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare vectorized Black-Scholes pricing and implied volatility against per-contract loops.")
+    parser.add_argument('--contracts', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--iv-loop-contracts', type=int, default=500, help='Contracts solved one by one for the implied-volatility comparison.')
+    args = parser.parse_args()
+
+    print(f"{'case':<28}{'contracts':>10}{'loop (s)':>12}{'vectorized (s)':>16}{'speedup':>10}")
+    for n_contracts in args.contracts:
+        chain = make_chain(n_contracts)
+        loop_time, expected = timed(per_contract, chain)
+        vector_time, greeks = timed(lambda: Options.black_scholes_greeks(**chain))
+        for name in greeks:
+            np.testing.assert_allclose(greeks[name], [row[name] for row in expected], rtol=1e-7, atol=1e-9)
+        print(f"{'price + greeks':<28}{n_contracts:>10,}{loop_time:>12.3f}{vector_time:>16.4f}{loop_time / vector_time:>9.0f}x")
+
+        prices = greeks['price']
+        iv_args = {key: value for key, value in chain.items() if key != 'volatility'}
+        vector_time, _ = timed(lambda: Options.implied_volatility(price=prices, **iv_args))
+
+        sample = min(args.iv_loop_contracts, n_contracts)
+        loop_time, _ = timed(lambda: [
+            Options.implied_volatility(
+                chain['option_type'][i], prices[i], chain['spot'], chain['strike'][i],
+                chain['time_to_expiry'][i], chain['rate'], chain['dividend_yield']
+            )
+            for i in range(sample)
+        ])
+        loop_time *= n_contracts / sample
+        print(f"{'implied volatility':<28}{n_contracts:>10,}{loop_time:>12.3f}{vector_time:>16.4f}{loop_time / vector_time:>9.0f}x")
+    print("\nImplied-volatility loop times are extrapolated from --iv-loop-contracts solves.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Indicators'))
+
+import Indicators
+import Panel
+
+INDICATORS = [
+    'moving_average',
+    'exponential_moving_average',
+    'relative_strength_index',
+    'bollinger_bands',
+    'average_true_range',
+    'stochastic_oscillator',
+    'on_balance_volume',
+]
+
+def make_panel(n_tickers, n_bars, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2000-01-03', periods=n_bars)
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (n_bars, n_tickers)), axis=0))
+    spread = close * rng.uniform(0.001, 0.02, (n_bars, n_tickers))
+    panel = {
+        'open': close + rng.normal(0, 0.5, (n_bars, n_tickers)) * spread,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 1_000_000, (n_bars, n_tickers)).astype(float),
+    }
+    return {field: pd.DataFrame(values, index=index, columns=tickers) for field, values in panel.items()}
+
+def per_ticker_loop(panel, name):
+    function = getattr(Indicators, name)
+    results = {}
+    for ticker in panel['close'].columns:
+        frame = pd.DataFrame({field: values[ticker] for field, values in panel.items()})
+        results[ticker] = function(frame)
+    return results
+
+def timed(function, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Panel indicators against a per-ticker loop over Indicators.py.")
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=2520)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    panel = make_panel(args.tickers, args.bars)
+    print(f"{args.tickers} tickers x {args.bars} bars (best of {args.repeat})")
+    print(f"{'indicator':<30}{'loop (s)':>12}{'panel (s)':>12}{'speedup':>10}")
+    for name in INDICATORS:
+        loop_time = timed(per_ticker_loop, panel, name, repeat=args.repeat)
+        panel_time = timed(getattr(Panel, name), panel, repeat=args.repeat)
+        print(f"{name:<30}{loop_time:>12.4f}{panel_time:>12.4f}{loop_time / panel_time:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
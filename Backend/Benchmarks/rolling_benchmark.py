@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Indicators'))
+
+import Indicators
+
+def lambda_argmax(data, window):
+    return data.rolling(window).apply(lambda x: x.argmax(), raw=True)
+
+def lambda_argmin(data, window):
+    return data.rolling(window).apply(lambda x: x.argmin(), raw=True)
+
+def lambda_mean_absolute_deviation(data, window):
+    return data.rolling(window=window).apply(lambda x: np.mean(np.abs(x - x.mean())))
+
+CASES = [
+    ('rolling_argmax', lambda_argmax, Indicators.rolling_argmax),
+    ('rolling_argmin', lambda_argmin, Indicators.rolling_argmin),
+    ('rolling_mean_absolute_deviation', lambda_mean_absolute_deviation, Indicators.rolling_mean_absolute_deviation),
+]
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the linear-time rolling primitives against rolling(...).apply lambdas.")
+    parser.add_argument('--bars', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--window', type=int, default=26)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"window={args.window}")
+    print(f"{'primitive':<34}{'bars':>10}{'lambda (s)':>12}{'new (s)':>10}{'speedup':>10}")
+    for bars in args.bars:
+        data = pd.Series(100 + np.cumsum(rng.normal(0, 1, bars)))
+        for name, reference, primitive in CASES:
+            reference_time, expected = timed(reference, data, args.window)
+            primitive_time, result = timed(primitive, data, args.window)
+            np.testing.assert_allclose(result, expected, rtol=1e-9)
+            print(f"{name:<34}{bars:>10}{reference_time:>12.3f}{primitive_time:>10.3f}{reference_time / primitive_time:>9.1f}x")
+
+if __name__ == '__main__':
+    main()
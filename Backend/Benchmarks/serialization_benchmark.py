@@ -0,0 +1,68 @@
+import argparse
+import gzip
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Indicators'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api'))
+
+import Indicators
+import serializers
+
+SERIES = {
+    '10y daily': pd.bdate_range('2015-01-02', periods=252 * 10),
+    '1y minute': pd.DatetimeIndex([
+        day + pd.Timedelta(hours=9, minutes=30 + minute)
+        for day in pd.bdate_range('2024-01-02', periods=252)
+        for minute in range(390)
+    ]),
+}
+
+def make_ohlcv(index, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+    spread = close * rng.uniform(0.0005, 0.005, len(index))
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 0.5, len(index)) * spread,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 1_000_000, len(index)),
+    }, index=index)
+
+def encode(chunks):
+    return b''.join(chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in chunks)
+
+def measure(result, fmt, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks, _ = serializers.serialize(result, fmt)
+        payload = encode(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best, len(payload), len(gzip.compress(payload))
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload size and serialization time for each indicator response format.")
+    parser.add_argument('--indicator', default='bollinger_bands')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for label, index in SERIES.items():
+        result = getattr(Indicators, args.indicator)(make_ohlcv(index))
+        print(f"\n{args.indicator}, {label} ({len(result):,} rows)")
+        print(f"{'format':<10}{'time (ms)':>12}{'bytes':>14}{'gzip bytes':>14}")
+        for fmt in serializers.MIMETYPES:
+            try:
+                seconds, size, compressed = measure(result, fmt, args.repeat)
+            except ImportError as e:
+                print(f"{fmt:<10}  skipped ({e})")
+                continue
+            print(f"{fmt:<10}{seconds * 1000:>12.2f}{size:>14,}{compressed:>14,}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SOURCE_DIRS = ['api', 'Indicators', 'Forecasts', 'LLM', 'Data', 'Calculators']
+
+# What each app.py subcommand imports before doing any work. The eager row
+# is what every subcommand used to load when Forecast.py imported all of its
+# backends at module level.
+SUBCOMMANDS = {
+    'indicator': ['app', 'pandas', 'Forecast', 'Indicators'],
+    'ask': ['app', 'LLM'],
+    'forecast': ['app', 'Forecast', 'prophet', 'matplotlib.pyplot'],
+    'eager (before)': [
+        'app', 'Indicators', 'LLM', 'Forecast', 'matplotlib.pyplot', 'prophet', 'pmdarima.arima',
+        'sklearn.ensemble', 'statsmodels.tsa.stattools', 'tensorflow.keras',
+    ],
+}
+
+PROBE = '''
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+failed = []
+for name in sys.argv[1:]:
+    try:
+        importlib.import_module(name)
+    except Exception as e:
+        failed.append(f"{name}: {type(e).__name__}")
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+    'failed': failed,
+}))
+'''
+
+def probe(modules):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(os.path.join(BACKEND, d) for d in SOURCE_DIRS))
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, *modules],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and peak RSS of each app.py subcommand in a fresh interpreter.")
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh processes per subcommand; the median time is reported.')
+    parser.add_argument('--subcommands', nargs='+', default=list(SUBCOMMANDS), choices=list(SUBCOMMANDS))
+    args = parser.parse_args()
+
+    print(f"{'subcommand':<18}{'import (s)':>12}{'max RSS (MB)':>14}{'modules':>10}")
+    for name in args.subcommands:
+        runs = [probe(SUBCOMMANDS[name]) for _ in range(args.repeat)]
+        seconds = statistics.median(run['seconds'] for run in runs)
+        rss = max(run['max_rss_mb'] for run in runs)
+        print(f"{name:<18}{seconds:>12.2f}{rss:>14.0f}{runs[-1]['modules']:>10}")
+        for failure in runs[-1]['failed']:
+            print(f"{'':<18}could not import {failure}")
+
+if __name__ == '__main__':
+    main()
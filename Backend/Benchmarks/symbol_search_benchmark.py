@@ -0,0 +1,85 @@
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data'))
+
+import SymbolIndex
+
+WORDS = [
+    'american', 'global', 'first', 'united', 'pacific', 'energy', 'capital', 'health', 'systems', 'motors',
+    'financial', 'technologies', 'foods', 'resources', 'pharmaceuticals', 'semiconductor', 'airlines',
+    'insurance', 'realty', 'networks', 'brands', 'industries', 'materials', 'solutions', 'bancorp',
+]
+SUFFIXES = ['Inc.', 'Corp.', 'Co.', 'Group', 'Holdings', 'plc', 'Ltd.']
+
+def _coined(rng):
+    syllables = ['ka', 'lo', 'vex', 'tri', 'mar', 'zen', 'qu', 'ar', 'dell', 'on', 'is', 'ter', 'gen', 'ox']
+    return ''.join(rng.choices(syllables, k=rng.randint(2, 4))).title()
+
+def make_universe(size, seed=0):
+    # A distinctive coined word, a few industry words and a legal suffix,
+    # roughly how listed company names look.
+    rng = random.Random(seed)
+    universe = {}
+    while len(universe) < size:
+        symbol = ''.join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5)))
+        words = [_coined(rng)] + [word.title() for word in rng.sample(WORDS, rng.randint(0, 2))]
+        universe[symbol] = ' '.join(words + [rng.choice(SUFFIXES)])
+    return universe
+
+def make_queries(universe, count, seed=1):
+    # Type-ahead prefixes of symbols and names, plus names with a typo.
+    rng = random.Random(seed)
+    items = list(universe.items())
+    queries = []
+    for _ in range(count):
+        symbol, name = rng.choice(items)
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(symbol[:rng.randint(1, len(symbol))])
+        elif kind < 0.8:
+            queries.append(name[:rng.randint(2, len(name))])
+        else:
+            position = rng.randrange(len(name))
+            queries.append(name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:])
+    return queries
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure symbol search latency and incremental index updates.")
+    parser.add_argument('--size', type=int, default=6_000, help='Symbols in the synthetic universe.')
+    parser.add_argument('--queries', type=int, default=5_000)
+    parser.add_argument('--changes', type=int, default=25, help='Symbols added, renamed and removed per update.')
+    args = parser.parse_args()
+
+    universe = make_universe(args.size)
+    start = time.perf_counter()
+    index = SymbolIndex.SymbolIndex(universe)
+    print(f"full build of {len(index)} symbols: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    latencies = sorted(timed(index.search, query) * 1e6 for query in make_queries(universe, args.queries))
+    print(f"search over {len(latencies)} queries: median {statistics.median(latencies):.0f} us, "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:.0f} us, max {latencies[-1]:.0f} us")
+
+    changed = dict(universe)
+    symbols = list(changed)
+    for symbol in symbols[:args.changes]:
+        del changed[symbol]
+    for symbol in symbols[args.changes:2 * args.changes]:
+        changed[symbol] += ' Renamed'
+    changed.update(make_universe(args.changes, seed=2))
+    seconds = timed(index.update, changed)
+    print(f"incremental update ({args.changes} added/renamed/removed): {seconds * 1000:.1f} ms")
+    print(f"full rebuild of the same universe: {timed(SymbolIndex.SymbolIndex, changed) * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
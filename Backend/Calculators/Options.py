@@ -0,0 +1,132 @@
+import numpy as np
+from scipy.special import ndtr
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+
+def _array(value):
+    return np.asarray(value, dtype=float)
+
+def _is_call(option_type):
+    option_type = np.char.lower(np.asarray(option_type, dtype=str))
+    is_call = option_type == 'call'
+    if not np.all(is_call | (option_type == 'put')):
+        raise ValueError("option_type must be 'call' or 'put'")
+    return is_call
+
+def _normal_pdf(x):
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+def _d1_d2(spot, strike, time_to_expiry, rate, volatility, dividend_yield):
+    sigma_sqrt_t = volatility * np.sqrt(np.maximum(time_to_expiry, 0))
+    log_moneyness = np.log(spot / strike) + (rate - dividend_yield) * time_to_expiry
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = np.where(
+            sigma_sqrt_t == 0,
+            # No time value left: the option sits at its (forward) intrinsic value.
+            np.where(log_moneyness > 0, np.inf, -np.inf),
+            # A missing (NaN) or negative volatility leaves everything NaN.
+            np.where(sigma_sqrt_t > 0, (log_moneyness + 0.5 * sigma_sqrt_t ** 2) / sigma_sqrt_t, np.nan)
+        )
+    return d1, d1 - sigma_sqrt_t, sigma_sqrt_t
+
+def black_scholes_price(option_type, spot, strike, time_to_expiry, rate, volatility, dividend_yield=0):
+    is_call = _is_call(option_type)
+    spot, strike, time_to_expiry, rate, volatility, dividend_yield = map(
+        _array, (spot, strike, time_to_expiry, rate, volatility, dividend_yield)
+    )
+    d1, d2, _ = _d1_d2(spot, strike, time_to_expiry, rate, volatility, dividend_yield)
+    spot_discount = spot * np.exp(-dividend_yield * time_to_expiry)
+    strike_discount = strike * np.exp(-rate * time_to_expiry)
+    call = spot_discount * ndtr(d1) - strike_discount * ndtr(d2)
+    put = strike_discount * ndtr(-d2) - spot_discount * ndtr(-d1)
+    return np.where(is_call, call, put)
+
+def black_scholes_greeks(option_type, spot, strike, time_to_expiry, rate, volatility, dividend_yield=0):
+    # Vega and rho are per unit (1.00 = 100 percentage points) of volatility
+    # and rate; theta is per year.
+    return _greeks(_is_call(option_type), *map(
+        _array, (spot, strike, time_to_expiry, rate, volatility, dividend_yield)
+    ))
+
+def _greeks(is_call, spot, strike, time_to_expiry, rate, volatility, dividend_yield):
+    d1, d2, sigma_sqrt_t = _d1_d2(spot, strike, time_to_expiry, rate, volatility, dividend_yield)
+    no_time_value = sigma_sqrt_t == 0
+    sqrt_t = np.sqrt(np.maximum(time_to_expiry, 0))
+
+    dividend_discount = np.exp(-dividend_yield * time_to_expiry)
+    rate_discount = np.exp(-rate * time_to_expiry)
+    spot_discount = spot * dividend_discount
+    strike_discount = strike * rate_discount
+    pdf_d1 = _normal_pdf(d1)
+    sign = np.where(is_call, 1.0, -1.0)
+    cdf_d1 = ndtr(sign * d1)
+    cdf_d2 = ndtr(sign * d2)
+
+    price = sign * (spot_discount * cdf_d1 - strike_discount * cdf_d2)
+    delta = sign * dividend_discount * cdf_d1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gamma = np.where(no_time_value, 0.0, dividend_discount * pdf_d1 / (spot * sigma_sqrt_t))
+        decay = np.where(no_time_value, 0.0, -spot_discount * pdf_d1 * volatility / (2 * sqrt_t))
+    vega = spot_discount * pdf_d1 * sqrt_t
+    theta = decay - sign * rate * strike_discount * cdf_d2 + sign * dividend_yield * spot_discount * cdf_d1
+    rho = sign * strike * time_to_expiry * rate_discount * cdf_d2
+
+    return {
+        'price': price,
+        'delta': delta,
+        'gamma': gamma,
+        'vega': vega,
+        'theta': theta,
+        'rho': rho,
+    }
+
+def implied_volatility(option_type, price, spot, strike, time_to_expiry, rate, dividend_yield=0,
+                       tol: float = 1e-8, max_iter: int = 100, low: float = 1e-6, high: float = 5.0):
+    is_call = _is_call(option_type)
+    price, spot, strike, time_to_expiry, rate, dividend_yield = np.broadcast_arrays(
+        *map(_array, (price, spot, strike, time_to_expiry, rate, dividend_yield))
+    )
+    is_call = np.broadcast_to(is_call, price.shape)
+
+    spot_discount = spot * np.exp(-dividend_yield * time_to_expiry)
+    strike_discount = strike * np.exp(-rate * time_to_expiry)
+    lower_bound = np.where(is_call, np.maximum(spot_discount - strike_discount, 0), np.maximum(strike_discount - spot_discount, 0))
+    upper_bound = np.where(is_call, spot_discount, strike_discount)
+
+    sigma = np.full(price.shape, np.nan)
+    active = (time_to_expiry > 0) & (price > lower_bound) & (price < upper_bound)
+
+    lo = np.full(price.shape, low)
+    hi = np.full(price.shape, high)
+    # Brenner-Subrahmanyam starting point, kept inside the bracket.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        guess = np.sqrt(2 * np.pi / time_to_expiry) * price / spot
+    sigma[active] = np.clip(np.nan_to_num(guess[active], nan=0.2), low, high)
+
+    for _ in range(max_iter):
+        index = np.flatnonzero(active)
+        if index.size == 0:
+            break
+        current = sigma.flat[index]
+        args = (
+            spot.flat[index], strike.flat[index], time_to_expiry.flat[index],
+            rate.flat[index], current, dividend_yield.flat[index]
+        )
+        greeks = _greeks(is_call.flat[index], *args)
+        diff = greeks['price'] - price.flat[index]
+
+        converged = np.abs(diff) < tol
+        too_high = diff > 0
+        lo.flat[index] = np.where(too_high, lo.flat[index], current)
+        hi.flat[index] = np.where(too_high, current, hi.flat[index])
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            newton = current - diff / greeks['vega']
+        bracket_lo, bracket_hi = lo.flat[index], hi.flat[index]
+        inside = np.isfinite(newton) & (newton > bracket_lo) & (newton < bracket_hi)
+        step = np.where(inside, newton, 0.5 * (bracket_lo + bracket_hi))
+
+        sigma.flat[index] = np.where(converged, current, step)
+        active.flat[index] = ~converged & (bracket_hi - bracket_lo > tol)
+
+    return sigma
@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+TRADING_DAYS = 252
+CHUNK_PATHS = 50_000
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+class GBMReturns:
+    # annual_return is the expected yearly growth in percent, so the mean
+    # simulated outcome lines up with calculate_future_value. Sums of
+    # independent normal steps are normal, so paths without contributions
+    # can jump straight to the horizon in one draw.
+    aggregates = True
+
+    def __init__(self, annual_return: float, volatility: float):
+        self.sigma = volatility / 100
+        self.drift = np.log1p(annual_return / 100) - 0.5 * self.sigma ** 2
+
+    def log_growth(self, rng, n_paths, years):
+        return rng.normal(self.drift * years, self.sigma * np.sqrt(years), n_paths)
+
+
+class BootstrapReturns:
+    # Resamples blocks of consecutive daily log returns, one block per step,
+    # which keeps the within-step autocorrelation of the real history.
+    aggregates = False
+
+    def __init__(self, log_returns):
+        log_returns = np.asarray(log_returns, dtype=float)
+        log_returns = log_returns[np.isfinite(log_returns)]
+        if log_returns.size == 0:
+            raise ValueError("Not enough price history to bootstrap returns")
+        self.cumulative = np.concatenate(([0.0], np.cumsum(log_returns)))
+
+    @classmethod
+    def from_prices(cls, prices):
+        prices = np.asarray(prices, dtype=float)
+        return cls(np.diff(np.log(prices)))
+
+    def log_growth(self, rng, n_paths, years):
+        n_returns = self.cumulative.size - 1
+        days = max(int(round(years * TRADING_DAYS)), 1)
+        if days <= n_returns:
+            starts = rng.integers(0, n_returns - days + 1, n_paths)
+            return self.cumulative[starts + days] - self.cumulative[starts]
+        # A step longer than the history chains blocks drawn with replacement
+        # that wrap around its end, so every day stays equally likely and the
+        # mean growth isn't pulled towards the middle of the history.
+        growth = np.zeros(n_paths)
+        while days > 0:
+            length = min(days, n_returns)
+            starts = rng.integers(0, n_returns, n_paths)
+            ends = starts + length
+            wrapped = np.maximum(ends - n_returns, 0)
+            growth += self.cumulative[np.minimum(ends, n_returns)] - self.cumulative[starts] + self.cumulative[wrapped]
+            days -= length
+        return growth
+
+
+def bootstrap_from_store(ticker, start, end=None):
+    import Store
+
+    data = Store.get_ohlcv(ticker, start, end)
+    if data is None or data.empty:
+        raise ValueError(f"No price history for {ticker}")
+    close = next(column for column in data.columns if str(column).lower() == 'close')
+    return BootstrapReturns.from_prices(data[close].to_numpy())
+
+
+def _simulate_chunk(model, seed, n_paths, n_steps, steps_per_year, initial, contribution):
+    rng = np.random.default_rng(seed)
+    if contribution == 0 and model.aggregates:
+        return initial * np.exp(model.log_growth(rng, n_paths, n_steps / steps_per_year))
+
+    # Only the running value of each path is kept, never the whole path.
+    value = np.full(n_paths, float(initial))
+    for _ in range(n_steps):
+        value += contribution
+        value *= np.exp(model.log_growth(rng, n_paths, 1 / steps_per_year))
+    return value
+
+
+def _chunks(n_paths, chunk_size):
+    return [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+
+
+def simulate_ending_values(model, years, steps_per_year=12, initial=0.0, contribution=0.0,
+                           n_paths: int = 100_000, seed=None, chunk_size: int = CHUNK_PATHS, workers=None):
+    n_steps = int(round(years * steps_per_year))
+    if n_paths <= 0 or n_steps <= 0:
+        raise ValueError("n_paths and years * steps_per_year must be positive")
+
+    sizes = _chunks(n_paths, chunk_size)
+    # One child seed per chunk, so results depend on the seed and chunk size
+    # but not on how many processes share the work.
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(model, child, size, n_steps, steps_per_year, initial, contribution) for child, size in zip(seeds, sizes)]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return np.concatenate([_simulate_chunk(*task) for task in tasks])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return np.concatenate(list(executor.map(_simulate_chunk, *zip(*tasks))))
+
+
+def summarize(ending_values, total_invested, percentiles=DEFAULT_PERCENTILES):
+    values = np.percentile(ending_values, percentiles)
+    return {
+        "percentiles": {f"{p:g}": float(v) for p, v in zip(percentiles, values)},
+        "mean": float(ending_values.mean()),
+        "std": float(ending_values.std()),
+        "total_invested": float(total_invested),
+        "probability_of_loss": float(np.mean(ending_values < total_invested)),
+        "paths": int(ending_values.size),
+    }
+
+
+def simulate_dca(model, contribution: float, years: float, steps_per_year: int = 12, initial_investment: float = 0,
+                 percentiles=DEFAULT_PERCENTILES, **options):
+    ending_values = simulate_ending_values(model, years, steps_per_year, initial_investment, contribution, **options)
+    total_invested = initial_investment + contribution * int(round(years * steps_per_year))
+    return summarize(ending_values, total_invested, percentiles)
+
+
+def simulate_compound_growth(model, principal: float, years: float, compounds_per_year: int = 1,
+                             percentiles=DEFAULT_PERCENTILES, **options):
+    ending_values = simulate_ending_values(model, years, compounds_per_year, principal, **options)
+    return summarize(ending_values, principal, percentiles)
+
+
+def simulate_future_value(model, present_value: float, years: float, percentiles=DEFAULT_PERCENTILES, **options):
+    return simulate_compound_growth(model, present_value, years, 1, percentiles, **options)
@@ -0,0 +1,109 @@
+import numpy as np
+
+def _array(value):
+    return np.asarray(value, dtype=float)
+
+def _safe_divide(numerator, denominator, where, fill):
+    numerator, denominator, where = np.broadcast_arrays(_array(numerator), _array(denominator), where)
+    out = np.full(numerator.shape, fill, dtype=float)
+    return np.divide(numerator, denominator, out=out, where=where)
+
+def calculate_stock_profit_loss(purchase_price, sale_price, quantity, purchase_commission=0, sale_commission=0):
+    gross_profit_loss = (_array(sale_price) - _array(purchase_price)) * _array(quantity)
+    total_commission = _array(purchase_commission) + _array(sale_commission)
+    net_profit_loss = gross_profit_loss - total_commission
+    gross_profit_loss, net_profit_loss, total_commission = np.broadcast_arrays(gross_profit_loss, net_profit_loss, total_commission)
+    return {
+        "gross_profit_loss": gross_profit_loss,
+        "net_profit_loss": net_profit_loss,
+        "total_commission": total_commission
+    }
+
+def calculate_position_size(account_balance, risk_percentage, entry_price, stop_loss_price):
+    risk_amount = _array(account_balance) * (_array(risk_percentage) / 100)
+    risk_per_share = _array(entry_price) - _array(stop_loss_price)
+    return _safe_divide(risk_amount, risk_per_share, risk_per_share > 0, 0.0)
+
+def calculate_risk_reward_ratio(entry_price, stop_loss_price, target_price):
+    potential_risk = _array(entry_price) - _array(stop_loss_price)
+    potential_reward = _array(target_price) - _array(entry_price)
+    return _safe_divide(potential_reward, potential_risk, potential_risk > 0, np.inf)
+
+def calculate_breakeven_point(purchase_price, quantity, total_fees):
+    quantity = _array(quantity)
+    total_cost = (_array(purchase_price) * quantity) + _array(total_fees)
+    return _safe_divide(total_cost, quantity, quantity != 0, np.nan)
+
+def calculate_capital_gains_tax(profit, tax_rate):
+    return _array(profit) * (_array(tax_rate) / 100)
+
+def calculate_dividend_yield(stock_price, annual_dividend_per_share):
+    stock_price = _array(stock_price)
+    return _safe_divide(_array(annual_dividend_per_share), stock_price, stock_price > 0, 0.0) * 100
+
+def calculate_investment_return(initial_investment, final_value):
+    initial_investment = _array(initial_investment)
+    absolute_return = _array(final_value) - initial_investment
+    percentage_return = _safe_divide(absolute_return, initial_investment, initial_investment != 0, np.inf) * 100
+    return {"absolute_return": absolute_return, "percentage_return": percentage_return}
+
+def calculate_cagr(beginning_value, ending_value, years):
+    beginning_value, ending_value, years = np.broadcast_arrays(_array(beginning_value), _array(ending_value), _array(years))
+    valid = (beginning_value > 0) & (years > 0)
+    cagr = np.zeros(beginning_value.shape)
+    with np.errstate(invalid='ignore'):
+        growth = ending_value[valid] / beginning_value[valid]
+        cagr[valid] = (growth ** (1 / years[valid]) - 1) * 100
+    return cagr
+
+def calculate_compound_growth(principal, annual_rate, years, compounds_per_year=1):
+    rate = _array(annual_rate) / 100
+    compounds_per_year = _array(compounds_per_year)
+    periods = compounds_per_year * _array(years)
+    growth = 1 + _safe_divide(rate, compounds_per_year, compounds_per_year != 0, np.nan)
+    future_value = _array(principal) * growth ** periods
+    return np.where(compounds_per_year != 0, future_value, np.nan)
+
+def calculate_future_value(present_value, annual_rate, years):
+    rate = _array(annual_rate) / 100
+    return _array(present_value) * ((1 + rate) ** _array(years))
+
+def calculate_present_value(future_value, annual_rate, years):
+    rate = _array(annual_rate) / 100
+    return _array(future_value) / ((1 + rate) ** _array(years))
+
+def calculate_dca(investment_amounts, share_prices):
+    investment_amounts = _array(investment_amounts)
+    total_invested = investment_amounts.sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_shares = (investment_amounts / _array(share_prices)).sum(axis=-1)
+    average_cost = _safe_divide(total_invested, total_shares, total_shares != 0, 0.0)
+    return {"total_shares": total_shares, "average_cost_per_share": average_cost}
+
+def calculate_average_price(quantities, prices):
+    quantities = _array(quantities)
+    total_cost = (quantities * _array(prices)).sum(axis=-1)
+    total_quantity = quantities.sum(axis=-1)
+    return _safe_divide(total_cost, total_quantity, total_quantity != 0, 0.0)
+
+def calculate_option_profit_loss(option_type, strike_price, stock_price_at_expiry, premium_paid, quantity=1, contracts=1):
+    option_type = np.char.lower(np.asarray(option_type, dtype=str))
+    is_call = option_type == 'call'
+    is_put = option_type == 'put'
+    if not np.all(is_call | is_put):
+        raise ValueError("option_type must be 'call' or 'put'")
+
+    strike_price = _array(strike_price)
+    stock_price_at_expiry = _array(stock_price_at_expiry)
+    intrinsic = np.where(
+        is_call,
+        np.maximum(0, stock_price_at_expiry - strike_price),
+        np.maximum(0, strike_price - stock_price_at_expiry)
+    )
+    profit_per_share = intrinsic - _array(premium_paid)
+    return profit_per_share * _array(quantity) * _array(contracts)
+
+def calculate_total_cost(trade_value, commission_rate=0, fixed_fee=0):
+    trade_value = _array(trade_value)
+    commission = trade_value * (_array(commission_rate) / 100)
+    return trade_value + commission + _array(fixed_fee)
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+def _positions(index):
+    if isinstance(index, pd.DatetimeIndex):
+        values = index.asi8
+        return (values - values[0]).astype(np.float64) if len(values) else values.astype(np.float64)
+    if pd.api.types.is_numeric_dtype(index):
+        return np.asarray(index, dtype=np.float64)
+    return np.arange(len(index), dtype=np.float64)
+
+def lttb_indices(x, y, max_points):
+    # Largest-Triangle-Three-Buckets: keep the first and last points, and
+    # from each bucket in between the point forming the largest triangle with
+    # the previously kept point and the average of the next bucket.
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (max_points - 2)
+    edges = (np.floor(np.arange(max_points - 1) * every) + 1).astype(np.int64)
+    edges[-1] = n - 1
+    bounds = np.append(edges, n)
+    # Prefix sums give each bucket's average in O(1).
+    x_sum = np.concatenate(([0.0], np.cumsum(x)))
+    y_sum = np.concatenate(([0.0], np.cumsum(y)))
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(max_points - 2):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        next_start, next_end = bounds[bucket + 1], bounds[bucket + 2]
+        count = next_end - next_start
+        avg_x = (x_sum[next_end] - x_sum[next_start]) / count
+        avg_y = (y_sum[next_end] - y_sum[next_start]) / count
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+def minmax_indices(y, n_buckets):
+    # Index of the minimum and maximum of every bucket, plus both ends, so
+    # spikes survive however far the series is reduced.
+    n = len(y)
+    if n == 0:
+        return np.arange(0)
+    if 2 * n_buckets + 2 >= n:
+        return np.arange(n)
+    bucket = np.arange(n) * n_buckets // n
+    order = np.lexsort((y, bucket))
+    firsts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    lasts = np.r_[firsts[1:] - 1, n - 1]
+    return np.unique(np.concatenate(([0, n - 1], order[firsts], order[lasts])))
+
+def _finite_indices(values, select):
+    finite = np.flatnonzero(np.isfinite(values))
+    if len(finite) == 0:
+        return finite
+    return finite[select(finite, values[finite])]
+
+def _numeric(values):
+    return pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values)
+
+def _columns(data):
+    # Non-numeric columns (labels, signals) don't shape the selection; their
+    # rows are kept or dropped along with the numeric ones.
+    if isinstance(data, pd.Series):
+        return [data.to_numpy(dtype=np.float64)] if _numeric(data) else []
+    return [data[column].to_numpy(dtype=np.float64) for column in data.columns if _numeric(data[column])]
+
+def _even(rows, max_points):
+    # An evenly spaced pick of at most max_points rows, both ends included.
+    if len(rows) <= max_points:
+        return rows
+    return rows[np.unique(np.linspace(0, len(rows) - 1, max_points).round().astype(np.int64))]
+
+def _capped(keep, max_points):
+    return _even(np.unique(np.concatenate(keep)), max_points)
+
+def lttb(data, max_points):
+    # For a DataFrame every column is reduced to max_points on its own and
+    # the union of the kept rows, evenly thinned back to max_points, is
+    # returned, so columns stay aligned. Correlated columns (MACD, bands)
+    # mostly pick the same rows, so little is thinned away.
+    if len(data) <= max_points:
+        return data
+    columns = _columns(data)
+    if not columns:
+        return data.iloc[_even(np.arange(len(data)), max_points)]
+    x = _positions(data.index)
+    budget = max(max_points, 3)
+    keep = [_finite_indices(values, lambda rows, finite: lttb_indices(x[rows], finite, budget)) for values in columns]
+    return data.iloc[_capped(keep, max_points)]
+
+def minmax_envelope(data, max_points):
+    # Bands (upper/middle/lower) keep every column's per-bucket extremes so
+    # the drawn envelope never looks narrower than the data.
+    if len(data) <= max_points:
+        return data
+    columns = _columns(data)
+    if not columns:
+        return data.iloc[_even(np.arange(len(data)), max_points)]
+    n_buckets = max((max_points - 2) // (2 * len(columns)), 1)
+    keep = [_finite_indices(values, lambda rows, finite: minmax_indices(finite, n_buckets)) for values in columns]
+    return data.iloc[_capped(keep, max_points)]
+
+def downsample(data, max_points, method='lttb'):
+    if max_points is None or len(data) <= max_points:
+        return data
+    if method == 'lttb':
+        return lttb(data, max_points)
+    if method == 'minmax':
+        return minmax_envelope(data, max_points)
+    raise ValueError(f"Unknown downsampling method '{method}'")
@@ -0,0 +1,264 @@
+import datetime
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ROOT = os.environ.get(
+    'STOCK_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'store')
+)
+
+# Tickers become directory and file names, so anything outside this set,
+# or made only of dots, could point outside the store root.
+TICKER_PATTERN = re.compile(r'(?=.*[A-Z0-9])[A-Z0-9.^=-]{1,15}')
+
+def validate_ticker(ticker):
+    symbol = str(ticker).upper()
+    if not TICKER_PATTERN.fullmatch(symbol):
+        raise ValueError(f"Invalid ticker symbol: {ticker!r}")
+    return symbol
+
+def yfinance_fetcher(ticker, start, end):
+    import yfinance as yf
+
+    data = yf.download(ticker, start=start, end=end, progress=False)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+def csv_fetcher(directory):
+    def fetch(ticker, start, end):
+        validate_ticker(ticker)
+        path = os.path.join(directory, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        data = pd.read_csv(path, index_col=0, parse_dates=True)
+        return data[(data.index >= start) & (data.index < end)]
+    return fetch
+
+def _day(value):
+    if value is None:
+        value = datetime.date.today() + datetime.timedelta(days=1)
+    return pd.Timestamp(value).tz_localize(None).normalize()
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+class OHLCVStore:
+    # One directory per ticker holding a raw float64 file per column plus an
+    # int64 nanosecond index file. Rows only ever get appended to the files,
+    # and meta.json (written last) records how many of them are valid, so
+    # reads can memory-map the columns and slice them without copying.
+    # Anything that isn't an append (a backfill before the first row) writes
+    # a new generation of files and switches to it through meta.json, so
+    # frames handed out earlier keep pointing at unchanged data.
+    #
+    # Coverage only extends to the day after the last bar actually fetched,
+    # so bars that hadn't been published yet are fetched on a later refresh.
+    # The same tail is re-checked at most every `recheck_seconds`.
+    def __init__(self, root: str = DEFAULT_ROOT, fetcher=yfinance_fetcher, recheck_seconds: float = 900):
+        self.root = root
+        self.fetcher = fetcher
+        self.recheck_seconds = recheck_seconds
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker):
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.RLock())
+
+    def _dir(self, ticker):
+        return os.path.join(self.root, validate_ticker(ticker))
+
+    def _file(self, ticker, position, generation=None):
+        suffix = '' if not generation else f".{generation}"
+        name = f"index{suffix}.bin" if position is None else f"col{position}{suffix}.bin"
+        return os.path.join(self._dir(ticker), name)
+
+    def meta(self, ticker):
+        path = os.path.join(self._dir(ticker), 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def version(self, ticker):
+        meta = self.meta(ticker)
+        return None if meta is None else meta['version']
+
+    def _write_meta(self, ticker, meta):
+        path = os.path.join(self._dir(ticker), 'meta.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def _arrays(self, ticker, meta):
+        def load(position, dtype):
+            if meta['rows'] == 0:
+                return np.empty(0, dtype=dtype)
+            path = self._file(ticker, position, meta.get('generation'))
+            return np.memmap(path, dtype=dtype, mode='r', shape=(meta['rows'],))
+
+        index = load(None, np.int64)
+        columns = [load(position, np.float64) for position in range(len(meta['columns']))]
+        return index, columns
+
+    def _normalize(self, data, columns=None):
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        if columns is not None:
+            data = data.reindex(columns=columns)
+        index = pd.DatetimeIndex(data.index)
+        tz = None if index.tz is None else str(index.tz)
+        return data, index, tz
+
+    def _write(self, ticker, data, coverage_start, coverage_end, previous=None):
+        data, index, tz = self._normalize(data)
+        generation = 1 if previous is None else previous.get('generation', 0) + 1
+        os.makedirs(self._dir(ticker), exist_ok=True)
+        with open(self._file(ticker, None, generation), 'wb') as f:
+            f.write(index.asi8.tobytes())
+        for position, column in enumerate(data.columns):
+            with open(self._file(ticker, position, generation), 'wb') as f:
+                f.write(data[column].to_numpy(dtype=np.float64).tobytes())
+
+        self._write_meta(ticker, {
+            'columns': [str(column) for column in data.columns],
+            'index_name': data.index.name,
+            'tz': tz,
+            'rows': len(data),
+            'start': str(coverage_start.date()),
+            'end': str(coverage_end.date()),
+            'version': 1 if previous is None else previous['version'] + 1,
+            'generation': generation,
+            'updated': _now(),
+            # When the tail was last looked for, and up to which date.
+            **{key: previous[key] for key in ('checked', 'checked_to') if previous and key in previous},
+        })
+        if previous is not None:
+            self._remove_generation(ticker, previous)
+
+    def _remove_generation(self, ticker, meta):
+        # Open memory maps keep the old data alive after the files are
+        # unlinked; where that isn't allowed the files are left behind.
+        for position in [None] + list(range(len(meta['columns']))):
+            try:
+                os.remove(self._file(ticker, position, meta.get('generation')))
+            except OSError:
+                pass
+
+    def _append(self, ticker, meta, data, coverage_end):
+        index, _ = self._arrays(ticker, meta)
+        last = index[-1] if len(index) else None
+        data, new_index, _ = self._normalize(data, meta['columns'])
+        if last is not None:
+            keep = new_index.asi8 > last
+            data, new_index = data[keep], new_index[keep]
+
+        meta = dict(meta, end=str(coverage_end.date()))
+        if len(data):
+            rows = meta['rows']
+            # Drop anything left past the last committed row by an interrupted append.
+            for position in [None] + list(range(len(meta['columns']))):
+                path = self._file(ticker, position, meta.get('generation'))
+                with open(path, 'ab') as f:
+                    f.truncate(rows * 8)
+                    values = new_index.asi8 if position is None else data[meta['columns'][position]].to_numpy(dtype=np.float64)
+                    f.write(values.tobytes())
+            meta.update(rows=rows + len(data), version=meta['version'] + 1, updated=_now())
+        self._write_meta(ticker, meta)
+
+    def _recently_checked(self, meta, end):
+        checked = meta.get('checked')
+        if checked is None or pd.Timestamp(meta.get('checked_to', meta['end'])) < end:
+            return False
+        age = datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(checked)
+        return age.total_seconds() < self.recheck_seconds
+
+    def _covered_until(self, data, end):
+        return min(end, _day(data.index.max()) + pd.Timedelta(days=1))
+
+    def refresh(self, ticker, start, end=None):
+        start, end = _day(start), _day(end)
+        with self._lock(ticker):
+            meta = self.meta(ticker)
+            if meta is None:
+                data = self.fetcher(ticker, start, end)
+                if data is None or data.empty:
+                    return None
+                self._write(ticker, data, start, self._covered_until(data, end))
+                self._write_meta(ticker, dict(self.meta(ticker), checked=_now(), checked_to=str(end.date())))
+                return self.meta(ticker)
+
+            # Older stores recorded the requested end, possibly in the future,
+            # rather than the last bar fetched.
+            today = _day(datetime.date.today())
+            covered_start, covered_end = pd.Timestamp(meta['start']), min(pd.Timestamp(meta['end']), today)
+            if start < covered_start:
+                head = self.fetcher(ticker, start, covered_start)
+                if head is not None and not head.empty:
+                    self._write(ticker, pd.concat([head, self._frame(ticker, meta)]), start, covered_end, meta)
+                else:
+                    self._write_meta(ticker, dict(meta, start=str(start.date())))
+                meta = self.meta(ticker)
+
+            if end > covered_end and not self._recently_checked(meta, end):
+                tail = self.fetcher(ticker, covered_end, end)
+                if tail is not None and not tail.empty:
+                    self._append(ticker, meta, tail, max(self._covered_until(tail, end), covered_end))
+                    meta = self.meta(ticker)
+                self._write_meta(ticker, dict(meta, end=str(min(pd.Timestamp(meta['end']), today).date()),
+                                              checked=_now(), checked_to=str(end.date())))
+                meta = self.meta(ticker)
+            return meta
+
+    def _frame(self, ticker, meta, start=None, end=None):
+        index, columns = self._arrays(ticker, meta)
+        lo = 0 if start is None else np.searchsorted(index, pd.Timestamp(start, tz=meta['tz']).value, side='left')
+        hi = len(index) if end is None else np.searchsorted(index, pd.Timestamp(end, tz=meta['tz']).value, side='left')
+
+        dates = pd.DatetimeIndex(index[lo:hi].view('datetime64[ns]'), name=meta['index_name'])
+        if meta['tz'] is not None:
+            dates = dates.tz_localize('UTC').tz_convert(meta['tz'])
+        return pd.DataFrame(
+            {name: values[lo:hi] for name, values in zip(meta['columns'], columns)},
+            index=dates,
+            copy=False
+        )
+
+    def read(self, ticker, start, end=None, refresh=True):
+        start, end = _day(start), _day(end)
+        # Held while the files are mapped so a concurrent refresh can't
+        # switch generations between reading meta.json and opening them.
+        with self._lock(ticker):
+            meta = self.refresh(ticker, start, end) if refresh else self.meta(ticker)
+            if meta is None:
+                return None
+            return self._frame(ticker, meta, start, end)
+
+
+_default_store = None
+_default_store_guard = threading.Lock()
+
+def get_store():
+    global _default_store
+    with _default_store_guard:
+        if _default_store is None:
+            fixtures = os.environ.get('STOCK_FIXTURE_DIR')
+            fetcher = csv_fetcher(fixtures) if fixtures else yfinance_fetcher
+            _default_store = OHLCVStore(fetcher=fetcher)
+        return _default_store
+
+def set_fetcher(fetcher):
+    get_store().fetcher = fetcher
+
+def get_ohlcv(ticker, start, end=None):
+    return get_store().read(ticker, start, end)
+
+def data_version(ticker):
+    return get_store().version(ticker)
@@ -0,0 +1,197 @@
+import bisect
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+import Ticker_conversion
+
+MIN_SIMILARITY = 0.3
+COMMON_GRAM_SHARE = 0.05
+CANDIDATES_PER_RESULT = 5
+CANDIDATE_GRAMS = 12
+SORT_MATCHES = 20
+
+def normalize(text):
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', text.casefold()).split())
+
+def trigrams(text):
+    # Padded so short queries and word starts still produce grams.
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _prefix_keys(symbol, name):
+    # (key, rank) pairs: the symbol itself, the full name, and every word of
+    # the name, so "motors" finds "General Motors".
+    keys = [(normalize(symbol), 0), (normalize(name), 1)]
+    keys += [(word, 2) for word in normalize(name).split()[1:]]
+    return [(key, rank) for key, rank in keys if key]
+
+
+class SymbolIndex:
+    # Type-ahead search over (symbol, name) pairs. Prefix matches come from
+    # sorted key arrays searched with bisect: one per rank (symbol, name,
+    # name word) and one per (rank, key length). Matches rank by rank, then
+    # by key length, so an exact symbol comes first. When a rank matches
+    # too many keys to sort, its length buckets are walked in order
+    # instead. Anything else falls back to trigram similarity. update()
+    # only re-indexes entries that changed and swaps in the new state in
+    # one assignment, so searches never see a half-built index.
+    def __init__(self, entries=()):
+        self._lock = threading.Lock()
+        self._state = ({}, {}, {}, {})
+        self.update(entries)
+
+    def __len__(self):
+        return len(self._state[0])
+
+    def update(self, entries):
+        # `entries` is the whole universe as {symbol: name} or (symbol, name)
+        # pairs; returns how many symbols were added, changed and removed.
+        entries = dict(entries)
+        with self._lock:
+            names, keys, postings, grams = self._state
+            removed = [symbol for symbol in names if symbol not in entries]
+            changed = [symbol for symbol, name in entries.items() if symbol in names and names[symbol] != name]
+            added = [symbol for symbol in entries if symbol not in names]
+            stale = set(removed) | set(changed)
+            fresh = changed + added
+
+            # Surviving keys are still sorted, so sorting them with the new
+            # ones appended is a merge rather than a full sort.
+            additions = defaultdict(list)
+            for symbol in fresh:
+                for key, rank in _prefix_keys(symbol, entries[symbol]):
+                    additions[rank].append((key, symbol))
+                    additions[(rank, len(key))].append((key, symbol))
+            buckets = {}
+            for bucket in set(keys) | set(additions):
+                merged = [item for item in keys.get(bucket, ()) if item[1] not in stale]
+                merged += additions.get(bucket, [])
+                if merged:
+                    merged.sort()
+                    buckets[bucket] = merged
+            # Plain ranks first, then (rank, length) buckets in ranking order.
+            keys = {bucket: buckets[bucket] for bucket in sorted(buckets, key=lambda bucket: (isinstance(bucket, tuple), bucket))}
+
+            # Copy-on-write: only the posting lists that change are rebuilt.
+            postings, grams = dict(postings), dict(grams)
+            touched = defaultdict(lambda: [set(), set()])
+            for symbol in stale:
+                for gram in grams.pop(symbol):
+                    touched[gram][0].add(symbol)
+            for symbol in fresh:
+                grams[symbol] = frozenset(trigrams(normalize(f"{symbol} {entries[symbol]}")))
+                for gram in grams[symbol]:
+                    touched[gram][1].add(symbol)
+            for gram, (drop, add) in touched.items():
+                posting = (postings.get(gram, frozenset()) - drop) | add
+                if posting:
+                    postings[gram] = posting
+                else:
+                    postings.pop(gram, None)
+
+            self._state = (entries, keys, postings, grams)
+        return {'added': len(added), 'changed': len(changed), 'removed': len(removed)}
+
+    def _range(self, bucket, query):
+        return bucket[bisect.bisect_left(bucket, (query,)):bisect.bisect_left(bucket, (query + '\uffff',))]
+
+    def _prefix(self, keys, query, limit):
+        found = {}
+        for rank in (0, 1, 2):
+            matches = self._range(keys.get(rank, ()), query)
+            if len(matches) <= SORT_MATCHES * limit:
+                matches.sort(key=lambda item: (len(item[0]), item))
+            else:
+                # Too many to sort: the length buckets hand them over
+                # already ordered, and the walk stops at `limit`.
+                matches = (
+                    item for bucket, values in keys.items()
+                    if isinstance(bucket, tuple) and bucket[0] == rank and bucket[1] >= len(query)
+                    for item in self._range(values, query)
+                )
+            for _, symbol in matches:
+                found.setdefault(symbol, None)
+                if len(found) >= limit:
+                    return list(found)
+        return list(found)
+
+    def _fuzzy(self, postings, grams, query, limit):
+        # Jaccard similarity between the query's trigrams and each entry's.
+        # Grams shared by a large part of the universe ("inc", "cor") say
+        # little and would make every query scan everything, so candidates
+        # are ranked on the rarer grams and only the best few are scored.
+        common = max(COMMON_GRAM_SHARE * len(grams), 50)
+        query_grams = trigrams(query)
+        # Long queries only count their rarest grams, which bounds the work
+        # per keystroke; the best candidates are still scored on all of them.
+        rare = sorted((len(postings[gram]), gram) for gram in query_grams if gram in postings)
+        counts = Counter()
+        for size, gram in rare[:CANDIDATE_GRAMS]:
+            if size <= common:
+                counts.update(postings[gram])
+        scored = []
+        for symbol, _ in counts.most_common(CANDIDATES_PER_RESULT * limit):
+            shared = len(query_grams & grams[symbol])
+            similarity = shared / (len(query_grams) + len(grams[symbol]) - shared)
+            if similarity >= MIN_SIMILARITY:
+                scored.append((-similarity, symbol))
+        return [symbol for _, symbol in sorted(scored)[:limit]]
+
+    def search(self, query, limit: int = 10, fuzzy: bool = True):
+        names, keys, postings, grams = self._state
+        query = normalize(query)
+        if not query:
+            return []
+        results = [
+            {'symbol': symbol, 'name': names[symbol], 'match': 'prefix'}
+            for symbol in self._prefix(keys, query, limit)
+        ]
+        # Fuzzy matching is the fallback for queries that prefix nothing,
+        # which is what a typo looks like while typing.
+        if fuzzy and not results:
+            results = [
+                {'symbol': symbol, 'name': names[symbol], 'match': 'fuzzy'}
+                for symbol in self._fuzzy(postings, grams, query, limit)
+            ]
+        return results
+
+
+def load_universe(map_path=Ticker_conversion.DEFAULT_PATH, store_root=None):
+    # Every resolved S&P 500 constituent plus any ticker already in the OHLCV
+    # store, which is named after its symbol if the map doesn't know it.
+    universe = {}
+    if store_root and os.path.isdir(store_root):
+        for ticker in os.listdir(store_root):
+            if os.path.exists(os.path.join(store_root, ticker, 'meta.json')):
+                universe[ticker.upper()] = ticker.upper()
+    for name, symbol in Ticker_conversion.SymbolMap(map_path).symbols().items():
+        if symbol:
+            universe[symbol.upper()] = name
+    return universe
+
+
+_default_index = None
+_default_index_guard = threading.Lock()
+_checked = {'at': 0.0, 'mtimes': None}
+
+def get_index(map_path=Ticker_conversion.DEFAULT_PATH, store_root=None, check_every: float = 60):
+    # The shared index, brought up to date at most once every `check_every`
+    # seconds, and only when the symbol map or the store's ticker list changed.
+    global _default_index
+    with _default_index_guard:
+        now = time.monotonic()
+        if _default_index is None or now - _checked['at'] > check_every:
+            _checked['at'] = now
+            mtimes = tuple(os.path.getmtime(path) if path and os.path.exists(path) else None
+                           for path in (map_path, store_root))
+            if _default_index is None or mtimes != _checked['mtimes']:
+                _checked['mtimes'] = mtimes
+                universe = load_universe(map_path, store_root)
+                if _default_index is None:
+                    _default_index = SymbolIndex(universe)
+                else:
+                    _default_index.update(universe)
+        return _default_index
@@ -0,0 +1,176 @@
+import argparse
+import datetime
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+SP500_URL = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
+DEFAULT_PATH = os.environ.get(
+    'TICKER_MAP_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'symbols', 'symbol_map.json')
+)
+
+# A source returns the universe as a DataFrame with 'Symbol' (as listed)
+# and 'Security' (company name) columns; a resolver maps a company name to
+# a Yahoo symbol, or None when it has none.
+
+def wikipedia_source(url=SP500_URL):
+    import requests
+
+    html = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30).text
+    df = pd.read_html(html, header=0)[0]
+    return df[['Symbol', 'Security']]
+
+def csv_source(path):
+    def fetch():
+        return pd.read_csv(path)[['Symbol', 'Security']]
+    return fetch
+
+def yahooquery_resolver(name):
+    from yahooquery import search
+
+    result = search(name)
+    if result and 'quotes' in result and len(result['quotes']) > 0:
+        return result['quotes'][0]['symbol']
+    return None
+
+def mapping_resolver(mapping):
+    def resolve(name):
+        value = mapping[name] if name in mapping else None
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return resolve
+
+@functools.lru_cache(maxsize=None)
+def sp500_constituents():
+    # One download per process, shared by tickers_sp500 and fetch_sp500_list.
+    return wikipedia_source()
+
+def tickers_sp500():
+    return sp500_constituents()['Symbol'].tolist()
+
+def fetch_sp500_list():
+    return sp500_constituents()['Security']
+
+def find_ticker(name):
+    return yahooquery_resolver(name)
+
+
+def _resolve_with_retries(resolver, name, retries, base_delay):
+    attempt = 0
+    while True:
+        try:
+            return resolver(name)
+        except Exception:
+            if attempt >= retries:
+                raise
+            time.sleep(random.uniform(0, base_delay * 2 ** attempt))
+            attempt += 1
+
+def resolve_all(names, resolver=yahooquery_resolver, workers: int = 8, retries: int = 3, base_delay: float = 0.5):
+    # Returns ({name: symbol or None}, {name: error}) for names whose lookups
+    # kept failing after `retries` retries.
+    resolved, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(_resolve_with_retries, resolver, name, retries, base_delay) for name in names}
+        for name, future in futures.items():
+            try:
+                resolved[name] = future.result()
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+    return resolved, errors
+
+
+class SymbolMap:
+    # Persistent company name -> symbol map. Each entry remembers the symbol
+    # the source listed it under, so a refresh only looks up constituents
+    # that are new or whose listing changed.
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def save(self):
+        with self._lock:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+
+    def stale(self, constituents, retry_missing=False):
+        names = []
+        for listed, name in zip(constituents['Symbol'], constituents['Security']):
+            entry = self.entries.get(name)
+            if entry is None or entry['listed'] != listed or (retry_missing and entry['symbol'] is None):
+                names.append(name)
+        return names
+
+    def refresh(self, source=sp500_constituents, resolver=yahooquery_resolver, workers: int = 8,
+                retries: int = 3, retry_missing=False):
+        constituents = source().drop_duplicates('Security')
+        stale = self.stale(constituents, retry_missing)
+        resolved, errors = resolve_all(stale, resolver, workers, retries)
+
+        listed = dict(zip(constituents['Security'], constituents['Symbol']))
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        with self._lock:
+            for name, symbol in resolved.items():
+                self.entries[name] = {'symbol': symbol, 'listed': listed[name], 'resolved': now}
+            # Names that left the universe are dropped; failed lookups are
+            # left out so the next refresh tries them again.
+            self.entries = {name: self.entries[name] for name in listed if name in self.entries}
+        self.save()
+        return {
+            'constituents': len(listed),
+            'looked_up': len(stale),
+            'reused': len(listed) - len(stale),
+            'not_found': sum(symbol is None for symbol in resolved.values()),
+            'errors': errors,
+        }
+
+    def symbols(self):
+        with self._lock:
+            return {name: entry['symbol'] for name, entry in self.entries.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve S&P 500 company names to Yahoo symbols, reusing the saved map.")
+    parser.add_argument('--source-csv', help='Read constituents (Symbol, Security) from this CSV instead of Wikipedia.')
+    parser.add_argument('--map-path', default=DEFAULT_PATH)
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent lookups.')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--retry-missing', action='store_true', help='Look up names that previously had no symbol again.')
+    parser.add_argument('--output', default='Output.txt')
+    args = parser.parse_args()
+
+    symbol_map = SymbolMap(args.map_path)
+    source = csv_source(args.source_csv) if args.source_csv else sp500_constituents
+    started = time.perf_counter()
+    stats = symbol_map.refresh(source, workers=args.workers, retries=args.retries, retry_missing=args.retry_missing)
+
+    with open(args.output, 'w') as output:
+        symbols = symbol_map.symbols()
+        print(len(symbols), file=output)
+        for name, symbol in symbols.items():
+            print(symbol if symbol else f"Ticker not found for {name}", file=output)
+    for name, error in stats['errors'].items():
+        print(f"Lookup failed for {name}: {error}", file=sys.stderr)
+    print(f"{stats['constituents']} constituents: {stats['looked_up']} looked up, {stats['reused']} reused, "
+          f"{stats['not_found']} not found, {len(stats['errors'])} failed in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
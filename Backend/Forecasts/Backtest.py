@@ -0,0 +1,251 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+import Forecast
+import ModelStore
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'BACKTEST_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backtest_cache')
+)
+
+def _naive(frame, horizon):
+    return np.repeat(frame['Close'].iloc[-1], horizon)
+
+def _arima(frame, horizon):
+    forecast, _ = Forecast.arima_forecast(frame, n_periods=horizon)
+    return np.asarray(forecast)
+
+def _prophet(frame, horizon):
+    from prophet import Prophet
+
+    model = Prophet(**Forecast.PROPHET_PARAMS).fit(
+        frame.reset_index()[['Date', 'Close']].rename(columns={'Date': 'ds', 'Close': 'y'})
+    )
+    future = model.make_future_dataframe(periods=horizon, freq='B', include_history=False)
+    return model.predict(future)['yhat'].to_numpy()
+
+def _lstm(frame, horizon):
+    _, forecast = Forecast.lstm_forecast(frame, n_periods=horizon)
+    return forecast
+
+def _random_forest(frame, horizon):
+    return Forecast.random_forest_forecast(frame, n_periods=horizon)
+
+# model name -> function(training frame, horizon) returning `horizon` prices.
+# Bump the version when a model's behaviour changes so cached folds are
+# not reused.
+BACKTEST_MODELS = {
+    'naive': (_naive, 1),
+    'arima': (_arima, 1),
+    'prophet': (_prophet, 1),
+    'lstm': (_lstm, 1),
+    'random_forest': (_random_forest, 1),
+}
+
+
+def make_folds(n_rows, horizon, initial_train, step, max_folds=None, window=None):
+    # Rolling-origin folds: (train_start, origin). Training uses
+    # [train_start, origin) and the test is [origin, origin + horizon).
+    # window=None grows the training set; an int keeps it that long.
+    origins = list(range(initial_train, n_rows - horizon + 1, step))
+    if max_folds is not None:
+        origins = origins[-max_folds:]
+    return [(0 if window is None else max(0, origin - window), origin) for origin in origins]
+
+
+class SharedSeries:
+    # A ticker's index and close prices in one shared-memory block, so
+    # workers slice folds out of the same buffer instead of receiving a
+    # pickled copy with every task.
+    def __init__(self, index, values):
+        length = len(values)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(16 * length, 1))
+        self.spec = (self.shm.name, length)
+        block = np.ndarray((2, length), dtype=np.int64, buffer=self.shm.buf)
+        block[0] = pd.DatetimeIndex(index).asi8
+        block[1] = np.asarray(values, dtype=np.float64).view(np.int64)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+_attached = {}
+
+def _attach(spec):
+    name, length = spec
+    if name not in _attached:
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    block = np.ndarray((2, length), dtype=np.int64, buffer=_attached[name].buf)
+    return block[0].view('datetime64[ns]'), block[1].view(np.float64)
+
+def _fold_key(model, ticker, series, train_start, origin, horizon):
+    fold = series.iloc[train_start:origin + horizon]
+    payload = json.dumps([model, BACKTEST_MODELS[model][1], ticker, horizon, ModelStore.data_hash(fold)])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+def _run_fold(model, spec, train_start, origin, horizon, cache_path):
+    from threadpoolctl import threadpool_limits
+
+    index, values = _attach(spec)
+    frame = pd.DataFrame(
+        {'Close': values[train_start:origin]},
+        index=pd.DatetimeIndex(index[train_start:origin], name='Date'),
+        copy=False
+    )
+    record = {'origin': int(origin), 'last': float(values[origin - 1]),
+              'actual': values[origin:origin + horizon].tolist()}
+
+    started = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as quiet, contextlib.redirect_stdout(quiet), threadpool_limits(limits=1):
+            predicted = np.asarray(BACKTEST_MODELS[model][0](frame, horizon), dtype=np.float64)
+        if predicted.shape != (horizon,):
+            raise ValueError(f"expected {horizon} predictions, got shape {predicted.shape}")
+        record['predicted'] = predicted.tolist()
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['seconds'] = time.perf_counter() - started
+
+    if 'error' not in record:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path + '.tmp', 'w') as f:
+            json.dump(record, f)
+        os.replace(cache_path + '.tmp', cache_path)
+    return record
+
+
+def score(records):
+    ok = [record for record in records if 'predicted' in record]
+    if not ok:
+        return {'folds': 0, 'failed': len(records), 'rmse': np.nan, 'mape': np.nan,
+                'direction_accuracy': np.nan, 'flat_calls': np.nan}
+    actual = np.concatenate([record['actual'] for record in ok])
+    predicted = np.concatenate([record['predicted'] for record in ok])
+    last = np.concatenate([np.full(len(record['actual']), record['last']) for record in ok])
+    errors = predicted - actual
+    # Did the model call the move from the last training price right? A
+    # prediction of no move (always, for naive) calls no direction, so it is
+    # counted in flat_calls rather than as a miss.
+    called = np.sign(predicted - last)
+    moved = np.sign(actual - last)
+    calls = called != 0
+    return {
+        'folds': len(ok),
+        'failed': len(records) - len(ok),
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'mape': float(np.mean(np.abs(errors / actual)) * 100),
+        'direction_accuracy': float(np.mean(called[calls] == moved[calls]) * 100) if calls.any() else np.nan,
+        'flat_calls': float(np.mean(~calls) * 100),
+    }
+
+def walk_forward(tickers, models=('naive', 'arima', 'prophet', 'lstm', 'random_forest'), horizon=20,
+                 initial_train=750, step=60, max_folds=None, window=None, years=10,
+                 workers=None, cache_dir=DEFAULT_CACHE_DIR):
+    unknown = [model for model in models if model not in BACKTEST_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(unknown)}")
+    workers = workers or os.cpu_count() or 1
+
+    series, shared = {}, {}
+    for ticker in dict.fromkeys(ticker.upper() for ticker in tickers):
+        data = Forecast.get_stock_data(ticker, years=years)
+        if data is not None:
+            series[ticker] = data['Close'].astype(np.float64)
+
+    rows, timings = [], {}
+    try:
+        for ticker, close in series.items():
+            shared[ticker] = SharedSeries(close.index, close.to_numpy())
+
+        for model in models:
+            started = time.perf_counter()
+            records = {ticker: [] for ticker in series}
+            tasks = []
+            for ticker, close in series.items():
+                for train_start, origin in make_folds(len(close), horizon, initial_train, step, max_folds, window):
+                    key = _fold_key(model, ticker, close, train_start, origin, horizon)
+                    cache_path = os.path.join(cache_dir, model, ticker, f"{key}.json")
+                    if os.path.exists(cache_path):
+                        with open(cache_path) as f:
+                            records[ticker].append(dict(json.load(f), cached=True))
+                    else:
+                        tasks.append((ticker, (model, shared[ticker].spec, train_start, origin, horizon, cache_path)))
+
+            cached = sum(len(found) for found in records.values())
+            print(f"{model}: {len(tasks)} folds to run, {cached} cached")
+            if tasks:
+                context = multiprocessing.get_context('spawn')
+                with Forecast._thread_limit_env(1), \
+                        ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as executor:
+                    futures = {executor.submit(_run_fold, *arguments): (ticker, arguments) for ticker, arguments in tasks}
+                    for future in as_completed(futures):
+                        ticker, arguments = futures[future]
+                        try:
+                            records[ticker].append(future.result())
+                        except BrokenProcessPool as e:
+                            # A worker died (out of memory, a crash in native
+                            # code); its fold and any still queued fail, and
+                            # the folds already finished are kept.
+                            records[ticker].append({'origin': int(arguments[3]), 'seconds': 0.0,
+                                                    'error': f"{type(e).__name__}: {e}"})
+
+            wall_seconds = time.perf_counter() - started
+            timings[model] = wall_seconds
+            for ticker, found in records.items():
+                fresh = [record for record in found if not record.get('cached')]
+                rows.append(dict(
+                    model=model, ticker=ticker, **score(found),
+                    fit_seconds=sum(record['seconds'] for record in found),
+                    wall_seconds=wall_seconds,
+                    cached_folds=len(found) - len(fresh),
+                ))
+    finally:
+        for block in shared.values():
+            block.close()
+
+    return pd.DataFrame(rows), timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward (rolling-origin) evaluation of forecast models.")
+    parser.add_argument('tickers', nargs='+')
+    parser.add_argument('--models', nargs='+', default=list(BACKTEST_MODELS), choices=list(BACKTEST_MODELS))
+    parser.add_argument('--horizon', type=int, default=20, help='Trading days predicted per fold.')
+    parser.add_argument('--initial-train', type=int, default=750, help='Rows in the first training window.')
+    parser.add_argument('--step', type=int, default=60, help='Rows between fold origins.')
+    parser.add_argument('--max-folds', type=int, default=None, help='Keep only the most recent folds.')
+    parser.add_argument('--window', type=int, default=None, help='Fixed training window length (default: expanding).')
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--output', help='Write the per model/ticker table to this CSV file.')
+    args = parser.parse_args()
+
+    results, timings = walk_forward(
+        args.tickers, models=args.models, horizon=args.horizon, initial_train=args.initial_train,
+        step=args.step, max_folds=args.max_folds, window=args.window, years=args.years,
+        workers=args.workers, cache_dir=args.cache_dir
+    )
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(results.round(3).to_string(index=False))
+        summary = results.groupby('model', sort=False)[['rmse', 'mape', 'direction_accuracy', 'flat_calls', 'fit_seconds']].mean()
+        summary['wall_seconds'] = pd.Series(timings)
+        print("\nPer model (mean over tickers):")
+        print(summary.round(3).to_string())
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+if __name__ == '__main__':
+    main()
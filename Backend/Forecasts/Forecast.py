@@ -1,20 +1,28 @@
+import argparse
+import collections
+import contextlib
 import datetime
+import io
+import json
 import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
 import warnings
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import yfinance as yf
-from prophet import Prophet
-from pmdarima.arima import auto_arima
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_squared_error
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import MinMaxScaler
-from statsmodels.tsa.stattools import adfuller
-from tensorflow.keras.layers import LSTM, Dense
-from tensorflow.keras.models import Sequential
+from numpy.lib.stride_tricks import sliding_window_view
+import ModelStore
+import Store
+
+# The modelling backends (pmdarima, prophet, tensorflow, sklearn, matplotlib)
+# take seconds and hundreds of MB to import, so each is imported inside the
+# functions that use it and only loads the first time that model runs.
 
 warnings.filterwarnings('ignore')
 
@@ -22,8 +30,8 @@ def get_stock_data(ticker, years=10):
     start_date = datetime.datetime.now() - datetime.timedelta(days=365.25 * years)
     end_date = datetime.date.today()
     try:
-        data = yf.download(ticker, start=start_date, end=end_date)
-        if data.empty:
+        data = Store.get_ohlcv(ticker, start_date, end_date)
+        if data is None or data.empty:
             print(f"No data found for ticker {ticker}. Please check the symbol.")
             return None
         return data
@@ -31,22 +39,47 @@ def get_stock_data(ticker, years=10):
         print(f"Error fetching data for {ticker}: {e}")
         return None
 
-def arima_forecast(data, n_periods=30):
+ARIMA_PARAMS = {
+    'start_p': 0, 'start_q': 0,
+    'test': 'adf',
+    'max_p': 3, 'max_q': 3,
+    'm': 1,
+    'd': None,
+    'seasonal': False,
+    'start_P': 0,
+    'D': 0,
+}
+
+def _search_arima(train_data):
+    from pmdarima.arima import auto_arima
+
+    return auto_arima(train_data, **ARIMA_PARAMS,
+                      trace=True,
+                      error_action='ignore',
+                      suppress_warnings=True,
+                      stepwise=True)
+
+def _arima_interval(model, new_data):
+    _, conf_int = model.predict(n_periods=len(new_data), return_conf_int=True)
+    return conf_int[:, 0], conf_int[:, 1]
+
+def _update_arima(model, train_data, new_data):
+    # Keeps the searched order and only folds in the new observations.
+    model.update(new_data)
+    return model
+
+def arima_forecast(data, n_periods=30, ticker=None):
     print("Running Auto-ARIMA forecast...")
     train_data = data['Close']
-    
-    model = auto_arima(train_data, start_p=0, start_q=0,
-                       test='adf',
-                       max_p=3, max_q=3,
-                       m=1,
-                       d=None,
-                       seasonal=False,
-                       start_P=0, 
-                       D=0, 
-                       trace=True,
-                       error_action='ignore',  
-                       suppress_warnings=True, 
-                       stepwise=True)
+
+    if ticker is None:
+        model = _search_arima(train_data)
+    else:
+        model, action = ModelStore.get_store().fit(
+            ticker, 'arima', ARIMA_PARAMS, train_data,
+            search=_search_arima, update=_update_arima, predict_interval=_arima_interval
+        )
+        print(f"ARIMA model {action}.")
 
     print(model.summary())
     
@@ -54,52 +87,158 @@ def arima_forecast(data, n_periods=30):
     print("ARIMA forecast complete.")
     return forecast, conf_int
 
-def lstm_forecast(data, look_back=60, epochs=5):
-    print("Running LSTM forecast...")
-    close_data = data.filter(['Close']).values
-    scaler = MinMaxScaler(feature_range=(0, 1))
-    scaled_data = scaler.fit_transform(close_data)
-
-    train_data_len = math.ceil(len(close_data) * .8)
-    train_data = scaled_data[0:train_data_len, :]
-
-    x_train, y_train = [], []
-    for i in range(look_back, len(train_data)):
-        x_train.append(train_data[i-look_back:i, 0])
-        y_train.append(train_data[i, 0])
-    
-    x_train, y_train = np.array(x_train), np.array(y_train)
-    x_train = np.reshape(x_train, (x_train.shape[0], x_train.shape[1], 1))
+def _lstm_model(look_back):
+    from tensorflow.keras.layers import LSTM, Dense, Input
+    from tensorflow.keras.models import Sequential
 
     model = Sequential([
-        LSTM(50, return_sequences=True, input_shape=(x_train.shape[1], 1)),
+        Input(shape=(look_back, 1)),
+        LSTM(50, return_sequences=True),
         LSTM(50, return_sequences=False),
         Dense(25),
         Dense(1)
     ])
     model.compile(optimizer='adam', loss='mean_squared_error')
-    model.fit(x_train, y_train, batch_size=1, epochs=epochs)
-
-    test_data = scaled_data[train_data_len - look_back:, :]
-    x_test = []
-    y_test = close_data[train_data_len:, :]
-    for i in range(look_back, len(test_data)):
-        x_test.append(test_data[i-look_back:i, 0])
-        
-    x_test = np.array(x_test)
-    x_test = np.reshape(x_test, (x_test.shape[0], x_test.shape[1], 1))
-
-    predictions = model.predict(x_test)
+    return model
+
+def _window_dataset(inputs, targets, batch_size, shuffle=False):
+    import tensorflow as tf
+
+    dataset = tf.data.Dataset.from_tensor_slices((inputs, targets))
+    if shuffle:
+        dataset = dataset.shuffle(len(inputs), seed=0, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+def _train_lstm(scaled, look_back, epochs, batch_size, patience, validation_fraction):
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    # Every row is a read-only view of look_back inputs plus the next value
+    # as the target; nothing is copied until the tensors are built.
+    windows = sliding_window_view(scaled, look_back + 1)[..., None]
+    inputs, targets = windows[:, :-1], windows[:, -1, 0]
+
+    n_validation = int(len(inputs) * validation_fraction)
+    n_train = len(inputs) - n_validation
+    train = _window_dataset(inputs[:n_train], targets[:n_train], batch_size, shuffle=True)
+    validation = _window_dataset(inputs[n_train:], targets[n_train:], batch_size) if n_validation else None
+
+    model = _lstm_model(look_back)
+    callbacks = [EarlyStopping(
+        monitor='val_loss' if validation is not None else 'loss',
+        patience=patience,
+        restore_best_weights=True
+    )]
+    model.fit(train, validation_data=validation, epochs=epochs, callbacks=callbacks, verbose=2)
+    return model
+
+def _recursive_forecast(model, history, n_periods):
+    import tensorflow as tf
+
+    # Each prediction is fed back in as the newest input for the next step.
+    # The whole loop runs as one compiled graph; stepping an LSTM eagerly
+    # from Python costs a few hundred milliseconds per call.
+    @tf.function
+    def run(window):
+        forecast = tf.TensorArray(tf.float32, size=n_periods)
+        for step in tf.range(n_periods):
+            prediction = model(window, training=False)
+            forecast = forecast.write(step, prediction[0, 0])
+            window = tf.concat([window[:, 1:, :], tf.reshape(prediction, (1, 1, 1))], axis=1)
+        return forecast.stack()
+
+    return run(tf.constant(history.reshape(1, -1, 1), dtype=tf.float32)).numpy()
+
+def lstm_forecast(data, look_back=60, epochs=20, batch_size=64, n_periods=30, patience=3,
+                  validation_fraction=0.1, ticker=None):
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.models import load_model
+
+    print("Running LSTM forecast...")
+    close_data = data.filter(['Close']).values
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    scaled_data = scaler.fit_transform(close_data)[:, 0].astype(np.float32)
+    train_data_len = math.ceil(len(close_data) * .8)
+
+    params = {'look_back': look_back, 'epochs': epochs, 'batch_size': batch_size,
+              'patience': patience, 'validation_fraction': validation_fraction}
+    cache_path = None
+    if ticker is not None:
+        cache_path = ModelStore.get_store().artifact_path(
+            ticker, 'lstm', params, f"{ModelStore.data_hash(data['Close'])}.keras"
+        )
+
+    if cache_path is not None and os.path.exists(cache_path):
+        print("Loading cached LSTM model.")
+        model = load_model(cache_path)
+    else:
+        started = time.perf_counter()
+        model = _train_lstm(scaled_data[:train_data_len], look_back, epochs, batch_size, patience, validation_fraction)
+        print(f"LSTM trained in {time.perf_counter() - started:.1f}s.")
+        if cache_path is not None:
+            model.save(cache_path)
+            # Models trained on older data are never loaded again.
+            directory = os.path.dirname(cache_path)
+            for name in os.listdir(directory):
+                if name.endswith('.keras') and name != os.path.basename(cache_path):
+                    os.remove(os.path.join(directory, name))
+
+    # One batched pass over the held-out region, then recursive steps past
+    # the end of the data.
+    x_test = sliding_window_view(scaled_data[train_data_len - look_back:-1], look_back)[..., None]
+    predictions = model.predict(x_test, batch_size=max(batch_size, 256), verbose=0)
     predictions = scaler.inverse_transform(predictions)
+
+    forecast = _recursive_forecast(model, scaled_data[-look_back:], n_periods)
+    forecast = scaler.inverse_transform(forecast.reshape(-1, 1))[:, 0]
     print("LSTM forecast complete.")
-    return predictions
+    return predictions, forecast
+
+def random_forest_forecast(data, look_back=20, n_periods=30, n_estimators=200, n_jobs=1, random_state=0):
+    from sklearn.ensemble import RandomForestRegressor
+
+    print("Running Random Forest forecast...")
+    close = data['Close'].to_numpy(dtype=np.float64)
+    returns = np.diff(np.log(close))
+
+    # Each row is look_back consecutive log returns followed by the next one
+    # as the target.
+    windows = sliding_window_view(returns, look_back + 1)
+    model = RandomForestRegressor(n_estimators=n_estimators, n_jobs=n_jobs, random_state=random_state)
+    model.fit(windows[:, :-1], windows[:, -1])
+
+    history = np.concatenate((returns[-look_back:], np.empty(n_periods)))
+    for step in range(n_periods):
+        history[look_back + step] = model.predict(history[step:look_back + step][None, :])[0]
+    print("Random Forest forecast complete.")
+    return close[-1] * np.exp(np.cumsum(history[look_back:]))
+
+PROPHET_PARAMS = {'daily_seasonality': True}
+
+def _prophet_interval(model, new_data):
+    predicted = model.predict(pd.DataFrame({'ds': new_data.index}))
+    return predicted['yhat_lower'].to_numpy(), predicted['yhat_upper'].to_numpy()
+
+def prophet_forecast(data, n_years=1, ticker=None):
+    from prophet import Prophet
 
-def prophet_forecast(data, n_years=1):
     print("Running Prophet forecast...")
     prophet_df = data.reset_index()[['Date', 'Close']].rename(columns={'Date': 'ds', 'Close': 'y'})
-    
-    model = Prophet(daily_seasonality=True)
-    model.fit(prophet_df)
+
+    if ticker is None:
+        model = Prophet(**PROPHET_PARAMS).fit(prophet_df)
+    else:
+        # Prophet can't absorb new rows incrementally, so updates refit on the
+        # full frame starting from the previous fit's parameters.
+        model, action = ModelStore.get_store().fit(
+            ticker, 'prophet', PROPHET_PARAMS, data['Close'],
+            search=lambda train_data: Prophet(**PROPHET_PARAMS).fit(prophet_df),
+            update=lambda previous, train_data, new_data: Prophet(**PROPHET_PARAMS).fit(
+                prophet_df, init=ModelStore.prophet_warm_start(previous)
+            ),
+            predict_interval=_prophet_interval,
+            dumps=ModelStore.prophet_dumps, loads=ModelStore.prophet_loads
+        )
+        print(f"Prophet model {action}.")
     
     future = model.make_future_dataframe(periods=365 * n_years)
     forecast = model.predict(future)
@@ -107,44 +246,363 @@ def prophet_forecast(data, n_years=1):
     print("Prophet forecast complete.")
     return forecast
 
-def plot_forecast(data, forecast, ticker, model_name=""):
-    plt.figure(figsize=(16, 8))
-    plt.title(f'{ticker} Stock Price Forecast using {model_name}')
-    plt.xlabel('Date', fontsize=16)
-    plt.ylabel('Close Price (USD)', fontsize=16)
-    
-    plt.plot(data.index, data['Close'], label='Historical Price')
+CHART_DIR = os.environ.get(
+    'FORECAST_CHART_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'charts')
+)
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
 
+def _forecast_frame(data, forecast):
+    # Every forecast shape the models return, as a frame of yhat (plus
+    # yhat_lower/yhat_upper when there is an interval) indexed by date.
     if isinstance(forecast, pd.DataFrame):
         if 'ds' in forecast.columns:
-            plt.plot(forecast['ds'], forecast['yhat'], label='Forecast', color='orange')
-            plt.fill_between(forecast['ds'], forecast['yhat_lower'], forecast['yhat_upper'], color='k', alpha=.1, label='Confidence Interval')
-        elif 'predicted_mean' in forecast.columns:
-             plt.plot(forecast.index, forecast['predicted_mean'], label='Forecast', color='orange')
-    else:
-        forecast_index = data.index[len(data) - len(forecast):]
-        plt.plot(forecast_index, forecast, label='Forecast', color='orange')
+            return forecast.set_index('ds')[['yhat', 'yhat_lower', 'yhat_upper']]
+        if 'predicted_mean' in forecast.columns:
+            return forecast[['predicted_mean']].rename(columns={'predicted_mean': 'yhat'})
+        return forecast
+    forecast = np.asarray(forecast).ravel()
+    return pd.DataFrame({'yhat': forecast}, index=data.index[len(data) - len(forecast):])
+
+def _draw_forecast(ax, data, forecast, ticker, model_name, max_points=None):
+    import Downsample
+
+    history = Downsample.downsample(data['Close'], max_points)
+    frame = _forecast_frame(data, forecast)
+    has_interval = 'yhat_lower' in frame.columns
+    # The interval is drawn as a band, so keep its per-bucket extremes.
+    frame = Downsample.downsample(frame, max_points, method='minmax' if has_interval else 'lttb')
+
+    ax.set_title(f'{ticker} Stock Price Forecast using {model_name}')
+    ax.set_xlabel('Date', fontsize=16)
+    ax.set_ylabel('Close Price (USD)', fontsize=16)
+    ax.plot(history.index, history, label='Historical Price')
+    ax.plot(frame.index, frame['yhat'], label='Forecast', color='orange')
+    if has_interval:
+        ax.fill_between(frame.index, frame['yhat_lower'], frame['yhat_upper'], color='k', alpha=.1, label='Confidence Interval')
+    ax.legend(loc='upper left')
+    ax.grid(True)
 
-    plt.legend(loc='upper left')
-    plt.grid(True)
+def plot_forecast(data, forecast, ticker, model_name=""):
+    import matplotlib.pyplot as plt
+
+    _, ax = plt.subplots(figsize=(16, 8))
+    _draw_forecast(ax, data, forecast, ticker, model_name)
     plt.show()
 
-def generate_ten_year_forecast(ticker):
+def render_forecast(data, forecast, ticker, model_name="", fmt='png', width=1600, height=800, dpi=100):
+    # Headless rendering: a bare Figure on the Agg canvas never touches
+    # pyplot's global state or a display, so it is safe in a server.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"Unsupported chart format '{fmt}'")
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    FigureCanvasAgg(figure)
+    # A line can't show more detail than the plot is pixels wide.
+    _draw_forecast(figure.add_subplot(), data, forecast, ticker, model_name, max_points=width)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt)
+    return buffer.getvalue()
+
+_chart_locks = {}
+_chart_locks_guard = threading.Lock()
+
+def forecast_chart(ticker, model='prophet', fmt='png', width=1600, height=800, years=15):
+    # Rendered charts are cached per ticker, model, size and store data
+    # version, so repeat views are a file read until new bars arrive.
+    if model not in BATCH_MODELS:
+        raise ValueError(f"Unknown model '{model}'")
+    if fmt not in CHART_FORMATS:
+        raise ValueError(f"Unsupported chart format '{fmt}'")
+    ticker = Store.validate_ticker(ticker)
+
+    data = get_stock_data(ticker, years=years)
+    if data is None:
+        return None
+    prefix = f"{model}-{width}x{height}-"
+    path = os.path.join(CHART_DIR, ticker, f"{prefix}v{Store.data_version(ticker)}.{fmt}")
+
+    with _chart_locks_guard:
+        lock = _chart_locks.setdefault(path, threading.Lock())
+    with lock:
+        if os.path.exists(path):
+            return path
+        forecast = BATCH_MODELS[model][0](data, ticker)
+        image = render_forecast(data, forecast, ticker, model, fmt, width, height)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(image)
+        os.replace(path + '.tmp', path)
+        # Charts for older data versions are never served again.
+        for name in os.listdir(os.path.dirname(path)):
+            if name.startswith(prefix) and name.endswith(f".{fmt}") and name != os.path.basename(path):
+                os.remove(os.path.join(os.path.dirname(path), name))
+    return path
+
+def generate_ten_year_forecast(ticker, output=None):
     print(f"Generating 10-year forecast for {ticker}...")
     data = get_stock_data(ticker, years=15)
     
     if data is None:
         return
 
-    forecast = prophet_forecast(data, n_years=10)
-    
-    plot_forecast(data, forecast, ticker, model_name="Prophet")
+    forecast = prophet_forecast(data, n_years=10, ticker=ticker)
+
+    if output:
+        fmt = os.path.splitext(output)[1].lstrip('.').lower() or 'png'
+        with open(output, 'wb') as f:
+            f.write(render_forecast(data, forecast, ticker, model_name="Prophet", fmt=fmt))
+        print(f"Chart written to {output}")
+    else:
+        plot_forecast(data, forecast, ticker, model_name="Prophet")
     
     final_price = forecast['yhat'].iloc[-1]
     final_date = forecast['ds'].iloc[-1].strftime('%Y-%m-%d')
     print(f"\nPredicted closing price for {ticker} on {final_date}: ${final_price:,.2f}")
 
+def _future_index(data, periods):
+    return pd.bdate_range(data.index[-1] + pd.offsets.BDay(1), periods=periods, name='ds')
+
+def _prophet_frame(data, ticker):
+    forecast = prophet_forecast(data, n_years=1, ticker=ticker)
+    forecast = forecast[forecast['ds'] > data.index[-1]]
+    return forecast.set_index('ds')[['yhat', 'yhat_lower', 'yhat_upper']]
+
+def _arima_frame(data, ticker):
+    forecast, conf_int = arima_forecast(data, n_periods=30, ticker=ticker)
+    return pd.DataFrame({
+        'yhat': np.asarray(forecast),
+        'yhat_lower': conf_int[:, 0],
+        'yhat_upper': conf_int[:, 1],
+    }, index=_future_index(data, len(conf_int)))
+
+def _lstm_frame(data, ticker):
+    _, forecast = lstm_forecast(data, ticker=ticker)
+    return pd.DataFrame({'yhat': forecast}, index=_future_index(data, len(forecast)))
+
+def _random_forest_frame(data, ticker):
+    forecast = random_forest_forecast(data, n_periods=30)
+    return pd.DataFrame({'yhat': forecast}, index=_future_index(data, len(forecast)))
+
+# model name -> (function returning a forecast DataFrame, default thread limit
+# per worker process).
+BATCH_MODELS = {
+    'prophet': (_prophet_frame, 1),
+    'arima': (_arima_frame, 1),
+    'lstm': (_lstm_frame, 2),
+    'random_forest': (_random_forest_frame, 1),
+}
+
+THREAD_ENV_VARS = (
+    'OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS',
+    'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS',
+)
+
+@contextlib.contextmanager
+def _thread_limit_env(threads):
+    # Native thread pools read these once when the library loads, so they
+    # have to be in the environment the spawned workers inherit.
+    previous = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    os.environ.update({name: str(threads) for name in THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+class ForecastTimeout(Exception):
+    pass
+
+@contextlib.contextmanager
+def _deadline(seconds):
+    if not seconds or not hasattr(signal, 'SIGALRM'):
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ForecastTimeout(f"timed out after {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+# Times a ticker is retried after its worker died and broke the pool.
+POOL_RESTARTS = 2
+
+def _result_path(output_dir, model, ticker):
+    return os.path.join(output_dir, model, f"{ticker}.csv")
+
+def _forecast_task(model, ticker, years, output_dir, timeout, threads):
+    from threadpoolctl import threadpool_limits
+
+    started = time.perf_counter()
+    log_path = os.path.join(output_dir, 'logs', model, f"{ticker}.log")
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    record = {'ticker': ticker, 'model': model}
+    try:
+        with open(log_path, 'w') as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log), \
+                threadpool_limits(limits=threads), _deadline(timeout):
+            data = get_stock_data(ticker, years=years)
+            if data is None:
+                raise ValueError(f"No data for {ticker}")
+            frame = BATCH_MODELS[model][0](data, ticker)
+
+        path = _result_path(output_dir, model, ticker)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        frame.to_csv(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        record.update(status='ok', path=path, rows=len(frame))
+    except ForecastTimeout as e:
+        record.update(status='timeout', error=str(e))
+    except Exception as e:
+        record.update(status='error', error=f"{type(e).__name__}: {e}")
+    record['seconds'] = round(time.perf_counter() - started, 3)
+    return record
+
+def _completed(manifest_path):
+    done = set()
+    if not os.path.exists(manifest_path):
+        return done
+    with open(manifest_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave a partial last line behind.
+                continue
+            if record.get('status') == 'ok' and os.path.exists(record.get('path', '')):
+                done.add((record['model'], record['ticker']))
+    return done
+
+def run_batch_forecasts(tickers, models=('prophet', 'arima', 'lstm'), output_dir='forecast_output',
+                        workers=None, threads=None, timeout=600, years=10, resume=True):
+    unknown = [model for model in models if model not in BATCH_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(unknown)}")
+    threads = threads or {}
+    workers = workers or os.cpu_count() or 1
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+    done = _completed(manifest_path) if resume else set()
+    summary = {'ok': 0, 'error': 0, 'timeout': 0, 'skipped': 0}
+
+    with open(manifest_path, 'a') as manifest:
+        # One pool per model, so each gets its own thread limit and a ticker
+        # is never refreshed in the store by two processes at once.
+        for model in models:
+            pending = [ticker for ticker in tickers if (model, ticker) not in done]
+            summary['skipped'] += len(tickers) - len(pending)
+            if not pending:
+                continue
+            model_threads = threads.get(model, BATCH_MODELS[model][1])
+            print(f"{model}: {len(pending)} tickers, {workers} workers x {model_threads} threads")
+
+            started = time.perf_counter()
+            context = multiprocessing.get_context('spawn')
+            finished = 0
+
+            def report(record):
+                nonlocal finished
+                finished += 1
+                manifest.write(json.dumps(record) + '\n')
+                manifest.flush()
+                summary[record['status']] += 1
+
+                elapsed = time.perf_counter() - started
+                eta = elapsed / finished * (len(pending) - finished)
+                detail = record.get('error', f"{record.get('seconds', 0):.1f}s")
+                print(f"[{model} {finished}/{len(pending)}] {record['ticker']}: {record['status']} ({detail}) eta {eta:,.0f}s")
+
+            # Only `workers` tickers are handed to the pool at a time, so when
+            # a worker dies (e.g. out of memory) and breaks the pool, the
+            # suspects are the tickers in flight; they are retried in a new
+            # pool and the rest of the queue is untouched.
+            queue = collections.deque(pending)
+            strikes = dict.fromkeys(pending, 0)
+            while queue:
+                suspects = []
+                with _thread_limit_env(model_threads), \
+                        ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                    in_flight = {}
+                    while queue or in_flight:
+                        while queue and len(in_flight) < workers and not suspects:
+                            ticker = queue.popleft()
+                            in_flight[executor.submit(_forecast_task, model, ticker, years, output_dir, timeout, model_threads)] = ticker
+                        if not in_flight:
+                            break
+                        completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in completed:
+                            ticker = in_flight.pop(future)
+                            try:
+                                record = future.result()
+                            except BrokenProcessPool:
+                                suspects.append(ticker)
+                                continue
+                            except Exception as e:
+                                record = {'ticker': ticker, 'model': model, 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+                            report(record)
+
+                for ticker in suspects:
+                    strikes[ticker] += 1
+                    if strikes[ticker] > POOL_RESTARTS:
+                        report({'ticker': ticker, 'model': model, 'status': 'error',
+                                'error': f"worker process died {strikes[ticker]} times"})
+                    else:
+                        queue.append(ticker)
+                if suspects and queue:
+                    print(f"{model}: a worker died, restarting the pool ({len(queue)} tickers left)")
+
+    print(f"Batch complete: {summary}")
+    return summary
+
+def _parse_threads(values):
+    threads = {}
+    for value in values or []:
+        model, _, count = value.partition('=')
+        threads[model] = int(count)
+    return threads
+
+def main():
+    parser = argparse.ArgumentParser(description="Run forecasts for many tickers in parallel, writing results as they finish.")
+    parser.add_argument('tickers', nargs='*', help='Tickers to forecast.')
+    parser.add_argument('--tickers-file', help='File with one ticker per line.')
+    parser.add_argument('--models', nargs='+', default=list(BATCH_MODELS), choices=list(BATCH_MODELS))
+    parser.add_argument('--output-dir', default='forecast_output')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count).')
+    parser.add_argument('--threads', nargs='*', metavar='MODEL=N', help='Per-process thread limit per model, e.g. lstm=4.')
+    parser.add_argument('--timeout', type=float, default=600, help='Seconds allowed per ticker and model.')
+    parser.add_argument('--years', type=int, default=10, help='Years of history to fit on.')
+    parser.add_argument('--no-resume', action='store_true', help='Recompute tickers already in the manifest.')
+    args = parser.parse_args()
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.strip() for line in f if line.strip()]
+
+    if not tickers:
+        stock_ticker = input("Enter a stock ticker to forecast (e.g., AAPL, GOOGL, MSFT): ").upper()
+        generate_ten_year_forecast(stock_ticker)
+        return
+
+    run_batch_forecasts(
+        tickers, models=args.models, output_dir=args.output_dir, workers=args.workers,
+        threads=_parse_threads(args.threads), timeout=args.timeout, years=args.years,
+        resume=not args.no_resume
+    )
 
 if __name__ == '__main__':
-    stock_ticker = input("Enter a stock ticker to forecast (e.g., AAPL, GOOGL, MSFT): ").upper()
-    generate_ten_year_forecast(stock_ticker)
+    main()
@@ -0,0 +1,175 @@
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ROOT = os.environ.get(
+    'FORECAST_MODEL_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+)
+
+# Trailing observations fingerprinted to check that new data extends what a
+# model was trained on. Training windows slide forward, so the head of the
+# series can't be compared.
+ANCHOR_ROWS = 250
+
+def data_hash(series):
+    values = np.ascontiguousarray(series.to_numpy(dtype=np.float64))
+    index = np.ascontiguousarray(pd.DatetimeIndex(series.index).asi8)
+    return hashlib.sha1(index.tobytes() + values.tobytes()).hexdigest()
+
+def params_key(params):
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class ModelStore:
+    # One directory per ticker, model and hyperparameter set holding the
+    # serialized fitted model and a meta.json describing what it was trained
+    # on. fit() decides between reusing, updating with only the new
+    # observations, or a full search.
+    def __init__(self, root: str = DEFAULT_ROOT, max_age_days: float = 30,
+                 drift_window: int = 20, drift_tolerance: float = 0.3):
+        self.root = root
+        self.max_age = datetime.timedelta(days=max_age_days)
+        self.drift_window = drift_window
+        self.drift_tolerance = drift_tolerance
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, path):
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _dir(self, ticker, kind, params):
+        return os.path.join(self.root, ticker.upper(), kind, params_key(params))
+
+    def artifact_path(self, ticker, kind, params, name):
+        # For models that serialize themselves to a file instead of bytes.
+        directory = self._dir(ticker, kind, params)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, name)
+
+    def load(self, ticker, kind, params, loads=pickle.loads):
+        directory = self._dir(ticker, kind, params)
+        meta_path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None, None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, 'model.bin'), 'rb') as f:
+            return loads(f.read()), meta
+
+    def save(self, ticker, kind, params, model, meta, dumps=pickle.dumps):
+        directory = self._dir(ticker, kind, params)
+        os.makedirs(directory, exist_ok=True)
+        files = [('meta.json', json.dumps(meta), 'w')]
+        if model is not None:
+            files.insert(0, ('model.bin', dumps(model), 'wb'))
+        for name, payload, mode in files:
+            # meta.json goes last, so a half-written model is never picked up.
+            path = os.path.join(directory, name)
+            with open(path + '.tmp', mode) as f:
+                f.write(payload)
+            os.replace(path + '.tmp', path)
+
+    def _drifted(self, misses):
+        return len(misses) >= self.drift_window // 2 and np.mean(misses) > self.drift_tolerance
+
+    def _extends(self, meta, series):
+        last = pd.Timestamp(meta['last_date'])
+        if len(series) == 0 or series.index[-1] < last:
+            return False
+        anchor = series[series.index <= last].iloc[-ANCHOR_ROWS:]
+        return len(anchor) > 0 and anchor.index[-1] == last and data_hash(anchor) == meta['anchor_hash']
+
+    def fit(self, ticker, kind, params, series, search, update, predict_interval,
+            dumps=pickle.dumps, loads=pickle.loads):
+        # search(series) -> model fits from scratch. update(model, series, new)
+        # -> model refits cheaply given the observations added since the last
+        # fit. predict_interval(model, new) -> (lower, upper) arrays, used to
+        # score how well the stored model anticipated those observations.
+        with self._lock(self._dir(ticker, kind, params)):
+            model, meta = self.load(ticker, kind, params, loads)
+            action, misses = 'searched', []
+
+            if model is not None and meta['data_hash'] == data_hash(series):
+                return model, 'reused'
+
+            if model is not None and self._extends(meta, series) \
+                    and _now() - datetime.datetime.fromisoformat(meta['searched_at']) < self.max_age:
+                new = series[series.index > pd.Timestamp(meta['last_date'])]
+                if len(new) == 0:
+                    # Only the start of the window moved (e.g. a rerun on a
+                    # weekend): nothing to score or update the model with.
+                    self.save(ticker, kind, params, None, dict(
+                        meta, rows=len(series), data_hash=data_hash(series),
+                        anchor_hash=data_hash(series.iloc[-ANCHOR_ROWS:]), updated=_now().isoformat()
+                    ))
+                    return model, 'reused'
+                lower, upper = predict_interval(model, new)
+                values = new.to_numpy(dtype=np.float64)
+                outside = (values < np.asarray(lower)) | (values > np.asarray(upper))
+                misses = (meta['misses'] + outside.tolist())[-self.drift_window:]
+                if not self._drifted(misses):
+                    model = update(model, series, new)
+                    action = 'updated'
+
+            if action == 'searched':
+                model, misses = search(series), []
+                searched_at = _now().isoformat()
+            else:
+                searched_at = meta['searched_at']
+
+            last = series.index[-1]
+            self.save(ticker, kind, params, model, {
+                'ticker': ticker.upper(),
+                'model': kind,
+                'params': params,
+                'rows': len(series),
+                'last_date': last.isoformat(),
+                'data_hash': data_hash(series),
+                'anchor_hash': data_hash(series.iloc[-ANCHOR_ROWS:]),
+                'misses': misses,
+                'searched_at': searched_at,
+                'updated': _now().isoformat(),
+            }, dumps)
+            return model, action
+
+
+def prophet_warm_start(model):
+    # Initial values for Stan taken from a previously fitted Prophet model.
+    init = {name: model.params[name][0][0] for name in ('k', 'm', 'sigma_obs')}
+    init.update({name: model.params[name][0] for name in ('delta', 'beta')})
+    return init
+
+def prophet_dumps(model):
+    # Prophet serializes to JSON text; the store writes bytes.
+    from prophet.serialize import model_to_json
+
+    return model_to_json(model).encode()
+
+def prophet_loads(payload):
+    from prophet.serialize import model_from_json
+
+    return model_from_json(payload.decode())
+
+
+_default_store = None
+_default_store_guard = threading.Lock()
+
+def get_store():
+    global _default_store
+    with _default_store_guard:
+        if _default_store is None:
+            _default_store = ModelStore(
+                max_age_days=float(os.environ.get('FORECAST_MODEL_MAX_AGE_DAYS', 30))
+            )
+        return _default_store
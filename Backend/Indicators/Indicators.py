@@ -1,6 +1,7 @@
+from collections import deque
+
 import pandas as pd
 import numpy as np
-import yfinance as yf
 
 def _get_data_column(data, column_name="close"):
     if isinstance(data, pd.DataFrame):
@@ -10,6 +11,47 @@ def _get_data_column(data, column_name="close"):
     else:
         raise TypeError("Input data must be a pandas DataFrame or Series.")
 
+def _rolling_argmax_kernel(values, window):
+    out = np.full(len(values), np.nan)
+    candidates = deque()
+    last_nan = -1
+    for i, value in enumerate(values):
+        if value != value:
+            last_nan = i
+        else:
+            while candidates and values[candidates[-1]] < value:
+                candidates.pop()
+            candidates.append(i)
+
+        start = i - window + 1
+        while candidates and candidates[0] < start:
+            candidates.popleft()
+        if start >= 0 and last_nan < start:
+            out[i] = candidates[0] - start
+    return out
+
+def rolling_argmax(data: pd.Series, window: int):
+    values = data.to_numpy(dtype=float)
+    return pd.Series(_rolling_argmax_kernel(values.tolist(), window), index=data.index)
+
+def rolling_argmin(data: pd.Series, window: int):
+    values = -data.to_numpy(dtype=float)
+    return pd.Series(_rolling_argmax_kernel(values.tolist(), window), index=data.index)
+
+def rolling_mean_absolute_deviation(data: pd.Series, window: int, chunk_size: int = 1_000_000):
+    values = data.to_numpy(dtype=float)
+    out = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return pd.Series(out, index=data.index)
+
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    rows = max(1, chunk_size // window)
+    for start in range(0, len(windows), rows):
+        chunk = windows[start:start + rows]
+        deviation = np.abs(chunk - chunk.mean(axis=1, keepdims=True))
+        out[start + window - 1:start + window - 1 + len(chunk)] = deviation.mean(axis=1)
+    return pd.Series(out, index=data.index)
+
 def moving_average(data: pd.DataFrame, period: int = 20, column: str = "close"):
     price_data = _get_data_column(data, column)
     return price_data.rolling(window=period).mean()
@@ -18,83 +60,90 @@ def exponential_moving_average(data: pd.DataFrame, period: int = 20, column: str
     price_data = _get_data_column(data, column)
     return price_data.ewm(span=period, adjust=False).mean()
 
+def _supertrend_kernel(high, low, close, atr, multiplier):
+    n = len(close)
+    hl2 = (high + low) / 2
+    basic_upper = (hl2 + multiplier * atr).tolist()
+    basic_lower = (hl2 - multiplier * atr).tolist()
+    close = close.tolist()
+
+    final_upper = basic_upper[:]
+    final_lower = basic_lower[:]
+    for i in range(1, n):
+        if close[i-1] <= final_upper[i-1]:
+            final_upper[i] = min(basic_upper[i], final_upper[i-1])
+        if close[i-1] >= final_lower[i-1]:
+            final_lower[i] = max(basic_lower[i], final_lower[i-1])
+
+    trend = [np.nan] * n
+    if n > 0:
+        trend[0] = final_lower[0] if close[0] > final_lower[0] else final_upper[0]
+    for i in range(1, n):
+        # Every branch tests its own comparison, as a NaN close or band
+        # matches none of them and leaves the row NaN.
+        prev = trend[i-1]
+        on_upper, on_lower = prev == final_upper[i-1], prev == final_lower[i-1]
+        if on_upper and close[i] <= final_upper[i]:
+            trend[i] = final_upper[i]
+        elif on_upper and close[i] > final_upper[i]:
+            trend[i] = final_lower[i]
+        elif on_lower and close[i] >= final_lower[i]:
+            trend[i] = final_lower[i]
+        elif on_lower and close[i] < final_lower[i]:
+            trend[i] = final_upper[i]
+
+    return np.array(trend, dtype=float), np.array(final_upper, dtype=float), np.array(final_lower, dtype=float)
+
 def supertrend(data: pd.DataFrame, atr_period: int = 10, multiplier: float = 3.0):
-    high = data['high']
-    low = data['low']
-    close = data['close']
-    
     atr = average_true_range(data, period=atr_period)
-    
-    basic_upper_band = (high + low) / 2 + multiplier * atr
-    basic_lower_band = (high + low) / 2 - multiplier * atr
-    
-    final_upper_band = basic_upper_band.copy()
-    final_lower_band = basic_lower_band.copy()
-    
-    for i in range(1, len(data)):
-        if close.iloc[i-1] <= final_upper_band.iloc[i-1]:
-            final_upper_band.iloc[i] = min(basic_upper_band.iloc[i], final_upper_band.iloc[i-1])
-        if close.iloc[i-1] >= final_lower_band.iloc[i-1]:
-            final_lower_band.iloc[i] = max(basic_lower_band.iloc[i], final_lower_band.iloc[i-1])
+    return _supertrend(data, atr, multiplier)
+
+def _supertrend(data, atr, multiplier):
+    trend, final_upper, final_lower = _supertrend_kernel(
+        data['high'].to_numpy(dtype=float), data['low'].to_numpy(dtype=float),
+        data['close'].to_numpy(dtype=float), atr.to_numpy(dtype=float), multiplier
+    )
+    return pd.DataFrame({'supertrend': trend, 'final_upper': final_upper, 'final_lower': final_lower}, index=data.index)
+
+def _parabolic_sar_kernel(high, low, initial_af, max_af, increment):
+    high = high.tolist()
+    low = low.tolist()
+    psar = low[:]
+    n = len(psar)
+    if n == 0:
+        return np.array(psar, dtype=float)
 
-    supertrend = pd.Series(np.nan, index=data.index)
-    if len(data) > 0:
-        if close.iloc[0] > final_lower_band.iloc[0]:
-             supertrend.iloc[0] = final_lower_band.iloc[0]
-        else:
-             supertrend.iloc[0] = final_upper_band.iloc[0]
-
-    for i in range(1, len(data)):
-        if supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and close.iloc[i] <= final_upper_band.iloc[i]:
-            supertrend.iloc[i] = final_upper_band.iloc[i]
-        elif supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and close.iloc[i] > final_upper_band.iloc[i]:
-            supertrend.iloc[i] = final_lower_band.iloc[i]
-        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and close.iloc[i] >= final_lower_band.iloc[i]:
-            supertrend.iloc[i] = final_lower_band.iloc[i]
-        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and close.iloc[i] < final_lower_band.iloc[i]:
-            supertrend.iloc[i] = final_upper_band.iloc[i]
-        
-    return pd.DataFrame({'supertrend': supertrend, 'final_upper': final_upper_band, 'final_lower': final_lower_band})
-
-def parabolic_sar(data: pd.DataFrame, initial_af: float = 0.02, max_af: float = 0.2, increment: float = 0.02):
-    high, low = data['high'], data['low']
-    psar = low.copy()
     bull = True
     af = initial_af
     ep = high[0]
-    
-    for i in range(2, len(data)):
+    for i in range(2, n):
         if bull:
-            psar[i] = psar[i-1] + af * (ep - psar[i-1])
-        else:
-            psar[i] = psar[i-1] - af * (psar[i-1] - ep)
-        
-        reverse = False
-        if bull:
-            if low[i] < psar[i]:
+            sar = psar[i-1] + af * (ep - psar[i-1])
+            if low[i] < sar:
                 bull = False
-                reverse = True
-                psar[i] = ep
+                sar = ep
                 ep = low[i]
                 af = initial_af
+            elif high[i] > ep:
+                ep = high[i]
+                af = min(af + increment, max_af)
         else:
-            if high[i] > psar[i]:
+            sar = psar[i-1] - af * (psar[i-1] - ep)
+            if high[i] > sar:
                 bull = True
-                reverse = True
-                psar[i] = ep
+                sar = ep
                 ep = high[i]
                 af = initial_af
+            elif low[i] < ep:
+                ep = low[i]
+                af = min(af + increment, max_af)
+        psar[i] = sar
+    return np.array(psar, dtype=float)
 
-        if not reverse:
-            if bull:
-                if high[i] > ep:
-                    ep = high[i]
-                    af = min(af + increment, max_af)
-            else:
-                if low[i] < ep:
-                    ep = low[i]
-                    af = min(af + increment, max_af)
-    return psar
+def parabolic_sar(data: pd.DataFrame, initial_af: float = 0.02, max_af: float = 0.2, increment: float = 0.02):
+    high, low = data['high'], data['low']
+    psar = _parabolic_sar_kernel(high.to_numpy(dtype=float), low.to_numpy(dtype=float), initial_af, max_af, increment)
+    return pd.Series(psar, index=low.index, name=low.name)
 
 def ichimoku_cloud(data: pd.DataFrame, tenkan_period: int = 9, kijun_period: int = 26, senkou_b_period: int = 52, chikou_period: int = 26):
     high = data['high']
@@ -115,11 +164,12 @@ def ichimoku_cloud(data: pd.DataFrame, tenkan_period: int = 9, kijun_period: int
     })
 
 def average_directional_index(data: pd.DataFrame, period: int = 14):
+    tr = average_true_range(data, period=period, return_tr=True)
+    return _average_directional_index(data, tr, period)
+
+def _average_directional_index(data, tr, period):
     high = data['high']
     low = data['low']
-    close = data['close']
-    
-    tr = average_true_range(data, period=period, return_tr=True)
     
     up_move = high.diff()
     down_move = -low.diff()
@@ -139,8 +189,8 @@ def aroon_oscillator(data: pd.DataFrame, period: int = 25):
     high = data['high']
     low = data['low']
     
-    aroon_up = 100 * high.rolling(period + 1).apply(lambda x: x.argmax(), raw=True) / period
-    aroon_down = 100 * low.rolling(period + 1).apply(lambda x: x.argmin(), raw=True) / period
+    aroon_up = 100 * rolling_argmax(high, period + 1) / period
+    aroon_down = 100 * rolling_argmin(low, period + 1) / period
     
     return aroon_up - aroon_down
 
@@ -157,7 +207,9 @@ def moving_average_convergence_divergence(data: pd.DataFrame, fast_period: int =
     price_data = _get_data_column(data, column)
     ema_fast = exponential_moving_average(price_data, period=fast_period)
     ema_slow = exponential_moving_average(price_data, period=slow_period)
-    
+    return _moving_average_convergence_divergence(ema_fast, ema_slow, signal_period)
+
+def _moving_average_convergence_divergence(ema_fast, ema_slow, signal_period):
     macd_line = ema_fast - ema_slow
     signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
     histogram = macd_line - signal_line
@@ -208,8 +260,13 @@ def williams_r(data: pd.DataFrame, period: int = 14):
     williams_r = -100 * ((highest_high - close) / (highest_high - lowest_low))
     return williams_r
 
+def _typical_price(data):
+    return (data['high'] + data['low'] + data['close']) / 3
+
 def money_flow_index(data: pd.DataFrame, period: int = 14):
-    typical_price = (data['high'] + data['low'] + data['close']) / 3
+    return _money_flow_index(data, _typical_price(data), period)
+
+def _money_flow_index(data, typical_price, period):
     raw_money_flow = typical_price * data['volume']
     
     price_diff = typical_price.diff(1)
@@ -226,9 +283,11 @@ def money_flow_index(data: pd.DataFrame, period: int = 14):
     return mfi
 
 def commodity_channel_index(data: pd.DataFrame, period: int = 20):
-    typical_price = (data['high'] + data['low'] + data['close']) / 3
+    return _commodity_channel_index(_typical_price(data), period)
+
+def _commodity_channel_index(typical_price, period):
     sma_tp = typical_price.rolling(window=period).mean()
-    mean_dev = typical_price.rolling(window=period).apply(lambda x: np.mean(np.abs(x - x.mean())))
+    mean_dev = rolling_mean_absolute_deviation(typical_price, period)
     
     cci = (typical_price - sma_tp) / (0.015 * mean_dev)
     return cci
@@ -280,13 +339,18 @@ def accumulation_distribution_line(data: pd.DataFrame):
     return ad_line
 
 def volume_weighted_average_price(data: pd.DataFrame):
+    return _volume_weighted_average_price(data, _typical_price(data))
+
+def _volume_weighted_average_price(data, typical_price):
     q = data['volume']
-    p = (data['high'] + data['low'] + data['close']) / 3
+    p = typical_price
     vwap = (p * q).cumsum() / q.cumsum()
     return vwap
 
 def money_flow(data: pd.DataFrame, period: int = 14):
-    typical_price = (data['high'] + data['low'] + data['close']) / 3
+    return _money_flow(data, _typical_price(data))
+
+def _money_flow(data, typical_price):
     return typical_price * data['volume']
 
 def bollinger_bands(data: pd.DataFrame, period: int = 20, std_dev: int = 2, column: str = "close"):
@@ -300,6 +364,12 @@ def bollinger_bands(data: pd.DataFrame, period: int = 20, std_dev: int = 2, colu
     return pd.DataFrame({'middle': middle_band, 'upper': upper_band, 'lower': lower_band})
 
 def average_true_range(data: pd.DataFrame, period: int = 14, return_tr: bool = False):
+    true_range = _true_range(data)
+    if return_tr:
+        return true_range
+    return _average_true_range(true_range, period)
+
+def _true_range(data):
     high = data['high']
     low = data['low']
     close = data['close']
@@ -308,17 +378,17 @@ def average_true_range(data: pd.DataFrame, period: int = 14, return_tr: bool = F
     tr2 = abs(high - close.shift())
     tr3 = abs(low - close.shift())
     
-    true_range = pd.DataFrame({'tr1': tr1, 'tr2': tr2, 'tr3': tr3}).max(axis=1)
-    if return_tr:
-        return true_range
-        
-    atr = true_range.ewm(span=period, adjust=False).mean()
-    return atr
+    return pd.DataFrame({'tr1': tr1, 'tr2': tr2, 'tr3': tr3}).max(axis=1)
+
+def _average_true_range(true_range, period):
+    return true_range.ewm(span=period, adjust=False).mean()
 
 def keltner_channel(data: pd.DataFrame, period: int = 20, atr_period: int = 10, multiplier: int = 2):
     ema = exponential_moving_average(data, period=period)
     atr = average_true_range(data, period=atr_period)
-    
+    return _keltner_channel(ema, atr, multiplier)
+
+def _keltner_channel(ema, atr, multiplier):
     upper_channel = ema + (atr * multiplier)
     lower_channel = ema - (atr * multiplier)
     
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+def _field_level(columns, fields):
+    # The level holding every field needed. Extra labels (yfinance's "Adj
+    # Close") are ignored; if a ticker level happens to hold them too (LOW,
+    # CLOSE), the level made up most of OHLCV fields wins.
+    needed = set(fields)
+    candidates = []
+    for position in range(columns.nlevels):
+        labels = {str(label).lower() for label in columns.get_level_values(position).unique()}
+        if needed <= labels:
+            candidates.append((len(labels & set(FIELDS)) / len(labels), -position))
+    if not candidates:
+        raise ValueError(f"No column level holds the fields {', '.join(sorted(needed))}; pass level= explicitly.")
+    return -max(candidates)[1]
+
+def to_panel(data, level=None, fields=FIELDS):
+    # A MultiIndex is split on `level`, or else on the level that holds all
+    # of `fields`.
+    if isinstance(data, dict):
+        return {str(field).lower(): frame for field, frame in data.items()}
+
+    if not isinstance(data, pd.DataFrame) or not isinstance(data.columns, pd.MultiIndex):
+        raise TypeError("Panel data must be a dict of wide DataFrames or a DataFrame with MultiIndex columns.")
+
+    if level is None:
+        level = _field_level(data.columns, fields)
+    labels = data.columns.get_level_values(level)
+    return {str(field).lower(): data.xs(field, axis=1, level=level) for field in labels.unique()}
+
+def _field(panel, name):
+    if name not in panel:
+        raise KeyError(f"Panel data has no '{name}' field.")
+    return panel[name]
+
+def _stack(outputs: dict):
+    return pd.concat(outputs, axis=1)
+
+def moving_average(data, period: int = 20, column: str = "close", level=None):
+    return _field(to_panel(data, level, (column,)), column).rolling(window=period).mean()
+
+def exponential_moving_average(data, period: int = 20, column: str = "close", level=None):
+    return _field(to_panel(data, level, (column,)), column).ewm(span=period, adjust=False).mean()
+
+def relative_strength_index(data, period: int = 14, column: str = "close", level=None):
+    delta = _field(to_panel(data, level, (column,)), column).diff(1)
+
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+
+    avg_gain = gain.ewm(com=period - 1, min_periods=period).mean()
+    avg_loss = loss.ewm(com=period - 1, min_periods=period).mean()
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+def bollinger_bands(data, period: int = 20, std_dev: int = 2, column: str = "close", level=None):
+    price_data = _field(to_panel(data, level, (column,)), column)
+    middle_band = price_data.rolling(window=period).mean()
+    std = price_data.rolling(window=period).std()
+
+    return _stack({
+        'middle': middle_band,
+        'upper': middle_band + (std * std_dev),
+        'lower': middle_band - (std * std_dev)
+    })
+
+def average_true_range(data, period: int = 14, return_tr: bool = False, level=None):
+    panel = to_panel(data, level, ('high', 'low', 'close'))
+    high = _field(panel, 'high')
+    low = _field(panel, 'low')
+    prev_close = _field(panel, 'close').shift()
+
+    true_range = np.fmax(np.fmax(abs(high - low), abs(high - prev_close)), abs(low - prev_close))
+    if return_tr:
+        return true_range
+    return true_range.ewm(span=period, adjust=False).mean()
+
+def stochastic_oscillator(data, k_period: int = 14, d_period: int = 3, level=None):
+    panel = to_panel(data, level, ('high', 'low', 'close'))
+    close = _field(panel, 'close')
+    lowest_low = _field(panel, 'low').rolling(window=k_period).min()
+    highest_high = _field(panel, 'high').rolling(window=k_period).max()
+
+    percent_k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    percent_d = percent_k.rolling(window=d_period).mean()
+
+    return _stack({'%K': percent_k, '%D': percent_d})
+
+def on_balance_volume(data, level=None):
+    panel = to_panel(data, level, ('close', 'volume'))
+    close = _field(panel, 'close')
+    volume = _field(panel, 'volume')
+    return (np.sign(close.diff()) * volume).fillna(0).cumsum()
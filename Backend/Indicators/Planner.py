@@ -0,0 +1,158 @@
+import inspect
+
+import pandas as pd
+
+import Indicators
+
+# Intermediate series that several indicators share. Each entry maps a node
+# name to a builder that receives the node's parameters and returns
+# (dependencies, compute), where compute(data, *dependency_values).
+_INTERMEDIATES = {
+    'typical_price': lambda: ([], lambda data: Indicators._typical_price(data)),
+    'true_range': lambda: ([], lambda data: Indicators._true_range(data)),
+    'atr': lambda period: (
+        [('true_range',)],
+        lambda data, true_range: Indicators._average_true_range(true_range, period)
+    ),
+    'ema': lambda period, column: (
+        [],
+        lambda data: Indicators.exponential_moving_average(data, period=period, column=column)
+    ),
+}
+
+# Indicators that can be assembled from shared intermediates. Builders take the
+# indicator's bound parameters (defaults applied) by name. Anything not listed
+# here is computed by calling the Indicators.py function directly.
+_INDICATORS = {
+    'exponential_moving_average': lambda period, column: (
+        [('ema', period, column)],
+        lambda data, ema: ema
+    ),
+    'average_true_range': lambda period, return_tr: (
+        [('true_range',) if return_tr else ('atr', period)],
+        lambda data, value: value
+    ),
+    'keltner_channel': lambda period, atr_period, multiplier: (
+        [('ema', period, 'close'), ('atr', atr_period)],
+        lambda data, ema, atr: Indicators._keltner_channel(ema, atr, multiplier)
+    ),
+    'supertrend': lambda atr_period, multiplier: (
+        [('atr', atr_period)],
+        lambda data, atr: Indicators._supertrend(data, atr, multiplier)
+    ),
+    'average_directional_index': lambda period: (
+        [('true_range',)],
+        lambda data, true_range: Indicators._average_directional_index(data, true_range, period)
+    ),
+    'money_flow_index': lambda period: (
+        [('typical_price',)],
+        lambda data, typical_price: Indicators._money_flow_index(data, typical_price, period)
+    ),
+    'commodity_channel_index': lambda period: (
+        [('typical_price',)],
+        lambda data, typical_price: Indicators._commodity_channel_index(typical_price, period)
+    ),
+    'volume_weighted_average_price': lambda: (
+        [('typical_price',)],
+        lambda data, typical_price: Indicators._volume_weighted_average_price(data, typical_price)
+    ),
+    'money_flow': lambda period: (
+        [('typical_price',)],
+        lambda data, typical_price: Indicators._money_flow(data, typical_price)
+    ),
+    'moving_average_convergence_divergence': lambda fast_period, slow_period, signal_period, column: (
+        [('ema', fast_period, column), ('ema', slow_period, column)],
+        lambda data, ema_fast, ema_slow: Indicators._moving_average_convergence_divergence(ema_fast, ema_slow, signal_period)
+    ),
+}
+
+def _bind_params(function, params):
+    bound = inspect.signature(function).bind(None, **params)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop(next(iter(arguments)))
+    return arguments
+
+def _indicator_node(name, params):
+    function = getattr(Indicators, name, None)
+    if name.startswith('_') or not callable(function):
+        raise ValueError(f"Indicator '{name}' not found")
+
+    arguments = _bind_params(function, params)
+    if name in _INDICATORS:
+        return _INDICATORS[name](**arguments)
+    return [], lambda data: function(data, **arguments)
+
+
+class IndicatorPlan:
+    def __init__(self, requests):
+        self.requests = []
+        self.nodes = {}
+        self.outputs = []
+        # A malformed request (params that aren't a dict, unhashable values)
+        # fails on its own instead of failing the whole plan.
+        for index, (name, params) in enumerate(requests):
+            key = ('indicator', index)
+            try:
+                if params is not None and not isinstance(params, dict):
+                    raise TypeError(f"params must be a mapping, not {type(params).__name__}")
+                params = dict(params or {})
+                dependencies, compute = _indicator_node(name, params)
+                self._add_intermediates(dependencies)
+            except Exception as e:
+                self.nodes[key] = ([], e)
+            else:
+                self.nodes[key] = (dependencies, compute)
+            self.requests.append((name, params))
+            self.outputs.append(key)
+
+    def _add_intermediates(self, keys):
+        for key in keys:
+            if key in self.nodes:
+                continue
+            name, *params = key
+            dependencies, compute = _INTERMEDIATES[name](*params)
+            self.nodes[key] = (dependencies, compute)
+            self._add_intermediates(dependencies)
+
+    def order(self):
+        ordered, seen = [], set()
+
+        def visit(key):
+            if key in seen:
+                return
+            seen.add(key)
+            for dependency in self.nodes[key][0]:
+                visit(dependency)
+            ordered.append(key)
+
+        for key in self.outputs:
+            visit(key)
+        return ordered
+
+    def run(self, data: pd.DataFrame, return_exceptions: bool = False):
+        values = {}
+        for key in self.order():
+            dependencies, compute = self.nodes[key]
+            if isinstance(compute, Exception):
+                values[key] = compute
+                continue
+            inputs = [values[dependency] for dependency in dependencies]
+            failed = next((value for value in inputs if isinstance(value, Exception)), None)
+            if failed is not None:
+                values[key] = failed
+                continue
+            try:
+                values[key] = compute(data, *inputs)
+            except Exception as e:
+                values[key] = e
+
+        results = [values[key] for key in self.outputs]
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+def compute_indicators(data: pd.DataFrame, requests, return_exceptions: bool = False):
+    return IndicatorPlan(requests).run(data, return_exceptions=return_exceptions)
@@ -0,0 +1,233 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+def _bar_value(bar, column="close"):
+    if isinstance(bar, (int, float, np.number)):
+        return float(bar)
+    value = bar[column]
+    return np.nan if value is None else float(value)
+
+def _divide(numerator, denominator):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float(np.float64(numerator) / np.float64(denominator))
+
+def _rows(data: pd.DataFrame, columns):
+    arrays = [data[column].to_numpy(dtype=float).tolist() for column in columns]
+    for values in zip(*arrays):
+        yield dict(zip(columns, values))
+
+
+class _EWM:
+    # Mirrors the recursion pandas uses for ewm(...).mean() (ignore_na=False),
+    # including the weight normalisation, so streamed values match the batch
+    # indicators bit for bit.
+    def __init__(self, com: float, adjust: bool, min_periods: int = 0):
+        alpha = 1. / (1. + com)
+        self.old_wt_factor = 1. - alpha
+        self.new_wt = 1. if adjust else alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.weighted = np.nan
+        self.old_wt = 1.
+        self.nobs = 0
+        self.started = False
+
+    def update(self, cur: float):
+        is_observation = cur == cur
+        if not self.started:
+            self.started = True
+            self.weighted = cur
+            self.nobs = int(is_observation)
+        else:
+            self.nobs += is_observation
+            if self.weighted == self.weighted:
+                self.old_wt *= self.old_wt_factor
+                if is_observation:
+                    if self.weighted != cur:
+                        self.weighted = (self.old_wt * self.weighted + self.new_wt * cur) / (self.old_wt + self.new_wt)
+                    if self.adjust:
+                        self.old_wt += self.new_wt
+                    else:
+                        self.old_wt = 1.
+            elif is_observation:
+                self.weighted = cur
+        return self.value
+
+    @property
+    def value(self):
+        return self.weighted if self.nobs >= self.min_periods else np.nan
+
+
+class IndicatorState:
+    columns = ('close',)
+
+    @classmethod
+    def from_history(cls, data: pd.DataFrame, **params):
+        state = cls(**params)
+        state.seed(data)
+        return state
+
+    def seed(self, data: pd.DataFrame):
+        if isinstance(data, pd.Series):
+            data = data.to_frame(self.columns[0])
+        for bar in _rows(data, self.columns):
+            self.update(bar)
+        return self
+
+    def update(self, bar):
+        raise NotImplementedError
+
+    def snapshot(self):
+        raise NotImplementedError
+
+
+class EMAState(IndicatorState):
+    def __init__(self, period: int = 20, column: str = "close"):
+        self.period = period
+        self.column = column
+        self.columns = (column,)
+        self._ewm = _EWM(com=(period - 1) / 2., adjust=False)
+
+    def update(self, bar):
+        self._ewm.update(_bar_value(bar, self.column))
+        return self.snapshot()
+
+    def snapshot(self):
+        return self._ewm.value
+
+
+class RSIState(IndicatorState):
+    def __init__(self, period: int = 14, column: str = "close"):
+        self.period = period
+        self.column = column
+        self.columns = (column,)
+        self.prev_price = None
+        self._avg_gain = _EWM(com=period - 1, adjust=True, min_periods=period)
+        self._avg_loss = _EWM(com=period - 1, adjust=True, min_periods=period)
+
+    def update(self, bar):
+        price = _bar_value(bar, self.column)
+        delta = np.nan if self.prev_price is None else price - self.prev_price
+        self.prev_price = price
+        self._avg_gain.update(delta if delta > 0 else 0.)
+        self._avg_loss.update(-(delta if delta < 0 else 0.))
+        return self.snapshot()
+
+    def snapshot(self):
+        rs = _divide(self._avg_gain.value, self._avg_loss.value)
+        return 100 - _divide(100, 1 + rs)
+
+
+class ATRState(IndicatorState):
+    columns = ('high', 'low', 'close')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = np.nan
+        self.true_range = np.nan
+        self._ewm = _EWM(com=(period - 1) / 2., adjust=False)
+
+    def update(self, bar):
+        high, low, close = (_bar_value(bar, column) for column in self.columns)
+        ranges = [abs(high - low), abs(high - self.prev_close), abs(low - self.prev_close)]
+        ranges = [value for value in ranges if value == value]
+        self.true_range = max(ranges) if ranges else np.nan
+        self.prev_close = close
+        self._ewm.update(self.true_range)
+        return self.snapshot()
+
+    def snapshot(self):
+        return self._ewm.value
+
+
+class MACDState(IndicatorState):
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9, column: str = "close"):
+        self.column = column
+        self.columns = (column,)
+        self._fast = EMAState(period=fast_period, column=column)
+        self._slow = EMAState(period=slow_period, column=column)
+        self._signal = _EWM(com=(signal_period - 1) / 2., adjust=False)
+        self.macd = np.nan
+
+    def update(self, bar):
+        self.macd = self._fast.update(bar) - self._slow.update(bar)
+        self._signal.update(self.macd)
+        return self.snapshot()
+
+    def snapshot(self):
+        signal = self._signal.value
+        return {'macd': self.macd, 'signal': signal, 'histogram': self.macd - signal}
+
+
+class _CumulativeSum:
+    # Cumulative sum with pandas' skipna semantics: missing values leave the
+    # running total untouched and show up as NaN at their own position.
+    def __init__(self):
+        self.total = 0.
+        self.last = np.nan
+
+    def update(self, value: float):
+        if value == value:
+            self.total += value
+            self.last = self.total
+        else:
+            self.last = np.nan
+        return self.last
+
+
+class OBVState(IndicatorState):
+    columns = ('close', 'volume')
+
+    def __init__(self):
+        self.prev_close = np.nan
+        self._obv = _CumulativeSum()
+
+    def update(self, bar):
+        close = _bar_value(bar, 'close')
+        volume = _bar_value(bar, 'volume')
+        flow = np.sign(close - self.prev_close) * volume
+        self.prev_close = close
+        self._obv.update(0. if math.isnan(flow) else float(flow))
+        return self.snapshot()
+
+    def snapshot(self):
+        return self._obv.last
+
+
+class VWAPState(IndicatorState):
+    columns = ('high', 'low', 'close', 'volume')
+
+    def __init__(self):
+        self._price_volume = _CumulativeSum()
+        self._volume = _CumulativeSum()
+
+    def update(self, bar):
+        high, low, close, volume = (_bar_value(bar, column) for column in self.columns)
+        typical_price = (high + low + close) / 3
+        self._price_volume.update(typical_price * volume)
+        self._volume.update(volume)
+        return self.snapshot()
+
+    def snapshot(self):
+        return _divide(self._price_volume.last, self._volume.last)
+
+
+class ADLineState(IndicatorState):
+    columns = ('high', 'low', 'close', 'volume')
+
+    def __init__(self):
+        self._ad_line = _CumulativeSum()
+
+    def update(self, bar):
+        high, low, close, volume = (_bar_value(bar, column) for column in self.columns)
+        clv = _divide((close - low) - (high - close), high - low)
+        if math.isnan(clv):
+            clv = 0.
+        with np.errstate(invalid='ignore'):
+            self._ad_line.update(float(np.float64(clv) * volume))
+        return self.snapshot()
+
+    def snapshot(self):
+        return self._ad_line.last
@@ -0,0 +1,175 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import time
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_MODEL = "qwen/qwen-2.5-72b-instruct:free"
+EXTRA_HEADERS = {
+    "HTTP-Referer": "https://your-site.com",  # Optional
+    "X-Title": "Your Site Name"               # Optional
+}
+
+
+class TokenBucket:
+    # Allows `rate` requests per second on average with bursts of up to
+    # `capacity`. Waiters are served in arrival order.
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _retryable(error):
+    import openai
+
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError, openai.RateLimitError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+def _retry_after(error):
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+async def ask(client, question, model=DEFAULT_MODEL, semaphore=None, bucket=None,
+              max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0, stats=None):
+    attempt = 0
+    while True:
+        try:
+            async with semaphore or contextlib.nullcontext():
+                # Taken once a slot is held, so tokens aren't spent by
+                # requests still queued on the semaphore and then released
+                # in a burst.
+                if bucket is not None:
+                    await bucket.acquire()
+                completion = await client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": question}],
+                    extra_headers=EXTRA_HEADERS
+                )
+            return completion.choices[0].message.content.strip()
+        except Exception as e:
+            if attempt >= max_retries or not _retryable(e):
+                raise
+            # Exponential backoff with full jitter, unless the server said
+            # how long to wait.
+            delay = _retry_after(e)
+            if delay is None:
+                delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            attempt += 1
+            if stats is not None:
+                stats['retries'] += 1
+            await asyncio.sleep(delay)
+
+
+def format_answer(position, question, answer=None, error=None):
+    if error is not None:
+        return f"Error processing Question {position}: {question}\n{error}\n"
+    return f"\n--- Question {position} ---\nQ: {question}\nA: {answer}\n"
+
+async def run_batch(questions, client, output=sys.stdout, model=DEFAULT_MODEL, concurrency: int = 8,
+                    rate: float = None, max_retries: int = 5, base_delay: float = 1.0, cache=None):
+    # Answers are written in question order as soon as every earlier one is
+    # done, so a partial output file is always a clean prefix of the batch.
+    # With a ResponseCache, repeated questions are answered without a request.
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate) if rate else None
+    stats = {'questions': len(questions), 'ok': 0, 'errors': 0, 'retries': 0, 'cached': 0}
+    started = time.perf_counter()
+
+    async def answer(position, question):
+        try:
+            text = cache.get(model, question) if cache is not None else None
+            if text is not None:
+                stats['cached'] += 1
+            else:
+                text = await ask(client, question, model, semaphore, bucket, max_retries, base_delay, stats=stats)
+                if cache is not None:
+                    cache.put(model, question, text)
+            stats['ok'] += 1
+            return format_answer(position, question, answer=text)
+        except Exception as e:
+            stats['errors'] += 1
+            return format_answer(position, question, error=str(e))
+
+    tasks = [asyncio.ensure_future(answer(position, question)) for position, question in enumerate(questions, 1)]
+    try:
+        for task in tasks:
+            output.write(await task)
+            output.flush()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+def make_client(base_url=DEFAULT_BASE_URL, api_key=None, timeout: float = 60):
+    from openai import AsyncOpenAI
+
+    # Retries are handled by ask(), so the client's own are turned off.
+    return AsyncOpenAI(
+        base_url=base_url,
+        api_key=api_key or os.getenv("OPENROUTER_API_KEY", "Enter your api key here"),
+        max_retries=0,
+        timeout=timeout
+    )
+
+def read_questions(path):
+    with open(path, "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+async def _main(args):
+    client = make_client(args.base_url, timeout=args.timeout)
+    cache = None
+    if not args.no_cache:
+        import ResponseCache
+        cache = ResponseCache.get_cache()
+    try:
+        with open(args.output, "w", encoding="utf-8") as output:
+            return await run_batch(
+                read_questions(args.input), client, output, model=args.model,
+                concurrency=args.concurrency, rate=args.rate, max_retries=args.max_retries, cache=cache
+            )
+    finally:
+        await client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a file of questions concurrently through an OpenAI-compatible API.")
+    parser.add_argument('--input', default='input.txt')
+    parser.add_argument('--output', default='Output.txt')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help='e.g. http://127.0.0.1:8765/v1 for the stub server.')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once.')
+    parser.add_argument('--rate', type=float, default=None, help='Average requests per second (default: unlimited).')
+    parser.add_argument('--max-retries', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--no-cache', action='store_true', help='Always ask the model, even for previously answered questions.')
+    args = parser.parse_args()
+
+    stats = asyncio.run(_main(args))
+    print(f"{stats['ok']}/{stats['questions']} answered ({stats['cached']} cached), {stats['errors']} errors, "
+          f"{stats['retries']} retries in {stats['seconds']:.1f}s", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import datetime
+
+import numpy as np
+
+import ResponseCache
+
+# A year of bars is enough to warm up every indicator in the summary,
+# including the 200-day average.
+LOOKBACK_DAYS = 400
+
+def _round(value, digits=2):
+    value = float(value)
+    return None if not np.isfinite(value) else round(value, digits)
+
+def _crossed(fast, slow, bars):
+    # Bars since `fast` last crossed `slow`, if within the last `bars`.
+    above = (fast > slow).to_numpy()[-(bars + 1):]
+    changes = np.flatnonzero(above[1:] != above[:-1])
+    return None if not len(changes) else int(len(above) - 2 - changes[-1])
+
+def build_summary(data):
+    import Indicators
+
+    data = data.rename(columns=str.lower)
+    close = data['close']
+    last = close.iloc[-1]
+    summary = {
+        'date': str(data.index[-1].date()),
+        'close': _round(last),
+        'change_1m_pct': _round((last / close.iloc[-22] - 1) * 100) if len(close) > 22 else None,
+    }
+
+    rsi = _round(Indicators.relative_strength_index(data).iloc[-1], 1)
+    summary['rsi_14'] = rsi
+    if rsi is not None:
+        summary['rsi_state'] = 'overbought' if rsi > 70 else 'oversold' if rsi < 30 else 'neutral'
+
+    macd = Indicators.moving_average_convergence_divergence(data)
+    summary['macd'] = {
+        'state': 'bullish' if macd['macd'].iloc[-1] > macd['signal'].iloc[-1] else 'bearish',
+        'histogram': _round(macd['histogram'].iloc[-1], 3),
+        'bars_since_cross': _crossed(macd['macd'], macd['signal'], 20),
+    }
+
+    if {'high', 'low'} <= set(data.columns):
+        trend = Indicators.supertrend(data)['supertrend'].iloc[-1]
+        if np.isfinite(trend):
+            summary['supertrend'] = 'up' if last >= trend else 'down'
+        summary['atr_14_pct'] = _round(Indicators.average_true_range(data).iloc[-1] / last * 100)
+
+    bands = Indicators.bollinger_bands(data).iloc[-1]
+    width = bands['upper'] - bands['lower']
+    summary['bollinger_pct_b'] = _round((last - bands['lower']) / width, 2) if width > 0 else None
+
+    sma_50 = Indicators.moving_average(data, period=50)
+    sma_200 = Indicators.moving_average(data, period=200)
+    if np.isfinite(sma_200.iloc[-1]):
+        summary['sma_50_vs_200'] = 'above' if sma_50.iloc[-1] > sma_200.iloc[-1] else 'below'
+        summary['price_vs_sma_200_pct'] = _round((last / sma_200.iloc[-1] - 1) * 100)
+    return summary
+
+def indicator_summary(ticker, cache=None):
+    # Returns (summary, data_version). The summary is computed once per data
+    # version and then read back from the cache, so repeated questions about
+    # the same ticker don't recompute any indicators.
+    import Store
+
+    cache = cache or ResponseCache.get_cache()
+    ticker = ticker.upper()
+    start = datetime.date.today() - datetime.timedelta(days=LOOKBACK_DAYS)
+    meta = Store.get_store().refresh(ticker, start)
+    if meta is None:
+        return None, None
+
+    summary = cache.get_summary(ticker, meta['version'])
+    if summary is None:
+        data = Store.get_store().read(ticker, start, refresh=False)
+        if data is None or data.empty:
+            return None, meta['version']
+        summary = cache.put_summary(ticker, meta['version'], dict(ticker=ticker, **build_summary(data)))
+    return summary, meta['version']
+
+def format_summary(summary):
+    parts = [f"{key}={value}" for key, value in summary.items() if key != 'macd' and value is not None]
+    macd = summary.get('macd')
+    if macd:
+        parts.append("macd=" + ",".join(f"{key}:{value}" for key, value in macd.items() if value is not None))
+    return "; ".join(parts)
+
+def build_prompt(question, ticker=None, cache=None):
+    # Returns (prompt, data_version) with the ticker's indicator summary
+    # prepended when one is available.
+    if ticker is None:
+        return question, None
+    summary, version = indicator_summary(ticker, cache)
+    if summary is None:
+        return question, version
+    context = format_summary(summary)
+    return f"Latest technical indicators for {summary['ticker']} (daily bars): {context}\n\n{question}", version
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute and print the indicator summary attached to LLM prompts.")
+    parser.add_argument('tickers', nargs='+')
+    args = parser.parse_args()
+
+    for ticker in args.tickers:
+        summary, version = indicator_summary(ticker)
+        if summary is None:
+            print(f"{ticker.upper()}: no data")
+        else:
+            print(f"{ticker.upper()} (data version {version}): {format_summary(summary)}")
+
+if __name__ == '__main__':
+    main()
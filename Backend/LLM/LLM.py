@@ -1,9 +1,32 @@
+import asyncio
 import os
-import google.generativeai as genai
-import yfinance as yf
-import pandas as pd
 import sys
-from openai import OpenAI
+import Batch
+import Context
+import ResponseCache
+
+def get_llm_response(question, ticker=None, model=Batch.DEFAULT_MODEL, use_cache=True):
+    from openai import OpenAI
+
+    # With a ticker, the prompt carries its precomputed indicator summary and
+    # the cached answer is tied to the data version it was computed from.
+    cache = ResponseCache.get_cache()
+    prompt, version = Context.build_prompt(question, ticker, cache)
+    if use_cache:
+        cached = cache.get(model, prompt, version)
+        if cached is not None:
+            return cached
+
+    client = OpenAI(
+        base_url=os.getenv("LLM_BASE_URL", Batch.DEFAULT_BASE_URL),
+        api_key=os.getenv("OPENROUTER_API_KEY", "Enter your api key here")
+    )
+    completion = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        extra_headers=Batch.EXTRA_HEADERS
+    )
+    return cache.put(model, prompt, completion.choices[0].message.content.strip(), version)
 
 # print("Current Working Directory:", os.getcwd())
 if __name__ == "__main__":
@@ -14,32 +37,23 @@ if __name__ == "__main__":
     # Read all questions from input.txt
     questions = [line.strip() for line in sys.stdin if line.strip()]
 
-    # Initialize OpenRouter client
-    client = OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key="Enter your api key here"  # Set this env variable OR hardcode your key
+    # Questions are answered concurrently (bounded, rate limited, retried on
+    # 429/5xx); answers are still written in question order.
+    client = Batch.make_client(
+        base_url=os.getenv("LLM_BASE_URL", Batch.DEFAULT_BASE_URL),
+        api_key=os.getenv("OPENROUTER_API_KEY", "Enter your api key here")  # Set this env variable OR hardcode your key
     )
 
-    # Call the API for each question
-    for i, question in enumerate(questions, 1):
+    async def answer_all():
         try:
-            completion = client.chat.completions.create(
-                model="qwen/qwen-2.5-72b-instruct:free",
-                messages=[{"role": "user", "content": question}],
-                extra_headers={
-                    "HTTP-Referer": "https://your-site.com",  # Optional
-                    "X-Title": "Your Site Name"               # Optional
-                }
+            return await Batch.run_batch(
+                questions, client, sys.stdout, cache=ResponseCache.get_cache(),
+                concurrency=int(os.getenv("LLM_CONCURRENCY", 8)),
+                rate=float(os.getenv("LLM_RATE", 0)) or None
             )
+        finally:
+            await client.close()
 
-            print(f"\n--- Question {i} ---")
-            print(f"Q: {question}")
-            print(f"A: {completion.choices[0].message.content.strip()}")
-        
-        except Exception as e:
-            print(f"Error processing Question {i}: {question}")
-            print(str(e))
-
-
-
-    
+    stats = asyncio.run(answer_all())
+    print(f"{stats['ok']}/{stats['questions']} answered ({stats['cached']} cached), {stats['errors']} errors, "
+          f"{stats['retries']} retries in {stats['seconds']:.1f}s", file=sys.stderr)
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.environ.get(
+    'LLM_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'llm_cache.sqlite3')
+)
+
+def normalize_prompt(prompt):
+    # Case and whitespace differences alone shouldn't cost another request.
+    return ' '.join(prompt.split()).casefold()
+
+def make_key(model, prompt, data_version=None):
+    payload = json.dumps([model, normalize_prompt(prompt), data_version])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    # Answers and per-ticker indicator summaries in one sqlite file, so they
+    # survive between CLI runs. Answers expire after `ttl` seconds and the
+    # least recently used ones are evicted past `max_entries`. Summaries are
+    # keyed by the data version they were computed from and never expire.
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = 7 * 24 * 3600, max_entries: int = 5_000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT, prompt TEXT, data_version TEXT, response TEXT, "
+                "created REAL, last_used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "ticker TEXT PRIMARY KEY, data_version TEXT, summary TEXT, created REAL)"
+            )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model, prompt, data_version=None):
+        key = make_key(model, prompt, data_version)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, model, prompt, response, data_version=None):
+        key = make_key(model, prompt, data_version)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, normalize_prompt(prompt), None if data_version is None else str(data_version),
+                 response, now, now)
+            )
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        return response
+
+    def get_summary(self, ticker, data_version):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT summary FROM summaries WHERE ticker = ? AND data_version = ?",
+                (ticker.upper(), str(data_version))
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put_summary(self, ticker, data_version, summary):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)",
+                (ticker.upper(), str(data_version), json.dumps(summary), time.time())
+            )
+        return summary
+
+    def clear(self):
+        with self._lock:
+            removed = self._db.execute("DELETE FROM responses").rowcount
+            self._db.execute("DELETE FROM summaries")
+        return removed
+
+    def stats(self):
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            summaries = self._db.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': size,
+            'summaries': summaries,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+        }
+
+
+_default_cache = None
+_default_cache_guard = threading.Lock()
+
+def get_cache():
+    global _default_cache
+    with _default_cache_guard:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                ttl=float(os.environ.get('LLM_CACHE_TTL', 7 * 24 * 3600)),
+                max_entries=int(os.environ.get('LLM_CACHE_SIZE', 5_000))
+            )
+        return _default_cache
@@ -0,0 +1,134 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# An OpenAI-compatible /chat/completions endpoint for exercising Batch.py
+# offline: fixed latency plus injectable 429 and 5xx failures.
+
+class StubState:
+    def __init__(self, latency: float = 0.2, jitter: float = 0.1, rate_limit_rate: float = 0.0,
+                 error_rate: float = 0.0, retry_after: float = None, seed: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'ok': 0, '429': 0, '500': 0}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def draw(self):
+        with self.lock:
+            self.counts['requests'] += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            roll = self.random.random()
+            delay = self.latency + self.random.uniform(0, self.jitter)
+        if roll < self.rate_limit_rate:
+            return 429, delay
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500, delay
+        return 200, delay
+
+    def finish(self, status):
+        with self.lock:
+            self.in_flight -= 1
+            self.counts['ok' if status == 200 else str(status)] += 1
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip('/').endswith('/stats'):
+                with state.lock:
+                    self._send(200, dict(state.counts, max_in_flight=state.max_in_flight))
+            else:
+                self._send(404, {'error': {'message': 'not found'}})
+
+        def do_POST(self):
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                self._send(404, {'error': {'message': 'not found'}})
+                return
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self._send(400, {'error': {'message': 'invalid JSON'}})
+                return
+
+            status, delay = state.draw()
+            time.sleep(delay)
+            try:
+                if status == 429:
+                    headers = {} if state.retry_after is None else {'Retry-After': f"{state.retry_after:g}"}
+                    self._send(429, {'error': {'message': 'rate limited', 'type': 'rate_limit_exceeded'}}, headers)
+                elif status == 500:
+                    self._send(500, {'error': {'message': 'internal error', 'type': 'server_error'}})
+                else:
+                    question = request.get('messages', [{}])[-1].get('content', '')
+                    self._send(200, {
+                        'id': f"stub-{time.time_ns()}",
+                        'object': 'chat.completion',
+                        'created': int(time.time()),
+                        'model': request.get('model', 'stub'),
+                        'choices': [{
+                            'index': 0,
+                            'message': {'role': 'assistant', 'content': f"Stub answer to: {question}"},
+                            'finish_reason': 'stop',
+                        }],
+                        'usage': {'prompt_tokens': len(question.split()), 'completion_tokens': 4, 'total_tokens': len(question.split()) + 4},
+                    })
+            finally:
+                state.finish(status)
+
+    return Handler
+
+def serve(host='127.0.0.1', port=8765, **options):
+    state = StubState(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server for offline LLM batch testing.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds per response before jitter.')
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500.')
+    parser.add_argument('--retry-after', type=float, default=None, help='Retry-After seconds sent with 429s.')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = serve(
+        args.host, args.port, latency=args.latency, jitter=args.jitter, rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate, retry_after=args.retry_after, seed=args.seed
+    )
+    print(f"Stub server on http://{args.host}:{args.port}/v1 (stats at /v1/stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,17 @@
 import argparse
 import os
-import pandas as pd
 
-import Indicators
-import LLM
-import forecasts
+# Each subcommand imports only the modules it needs, so `indicator` and
+# `ask` don't pay for loading the forecasting backends.
 
 def handle_indicator(args):
+    import pandas as pd
+    import Forecast
+    import Indicators
+
     print(f"Calculating indicator '{args.name}' for ticker '{args.ticker}'...")
     
-    data = forecasts.get_stock_data(args.ticker, years=5)
+    data = Forecast.get_stock_data(args.ticker, years=5)
     if data is None:
         return
 
@@ -47,6 +49,8 @@ def handle_indicator(args):
 
 
 def handle_ask(args):
+    import LLM
+
     print("Sending question to LLM...")
     if not os.getenv("OPENROUTER_API_KEY"):
         print("\n--- IMPORTANT ---")
@@ -55,14 +59,16 @@ def handle_ask(args):
         print("-----------------\n")
         return
         
-    response = LLM.get_llm_response(args.question)
+    response = LLM.get_llm_response(args.question, ticker=args.ticker, use_cache=not args.no_cache)
     print("\n--- LLM Response ---")
     print(response)
     print("\n--------------------\n")
 
 
 def handle_forecast(args):
-    forecasts.generate_ten_year_forecast(args.ticker)
+    import Forecast
+
+    Forecast.generate_ten_year_forecast(args.ticker, output=args.output)
 
 
 def main():
@@ -93,6 +99,8 @@ Example: period=50 std_dev=2'''
         description='Sends a question to a Large Language Model and prints the response.'
     )
     parser_ask.add_argument('question', type=str, help='The question to ask the LLM, enclosed in quotes.')
+    parser_ask.add_argument('--ticker', help='Attach the latest indicator summary for this ticker to the question.')
+    parser_ask.add_argument('--no-cache', action='store_true', help='Ask the model even if this question was answered before.')
     parser_ask.set_defaults(func=handle_ask)
 
     parser_forecast = subparsers.add_parser(
@@ -101,6 +109,7 @@ Example: period=50 std_dev=2'''
         description='Uses the Prophet model to generate and plot a 10-year forecast for a stock.'
     )
     parser_forecast.add_argument('ticker', type=str, help='The stock ticker to forecast (e.g., GOOGL).')
+    parser_forecast.add_argument('--output', help='Write the chart to this PNG/SVG file instead of opening a window.')
     parser_forecast.set_defaults(func=handle_forecast)
 
     args = parser.parse_args()
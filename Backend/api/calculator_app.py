@@ -1,8 +1,130 @@
-from flask import Flask, render_template, request, jsonify
-from calculators import *
+import datetime
+import json
+import os
+import time
+
+import numpy as np
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
+from Calculators import *
+import Options
+import Simulation
+import Vectorized
 
 app = Flask(__name__)
 
+BATCH_CHUNK_SIZE = 10_000
+SIMULATION_MAX_PATHS = int(os.environ.get('SIMULATION_MAX_PATHS', 5_000_000))
+SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', 0)) or None
+
+REQUIRED = object()
+
+def _number_list(parser):
+    return lambda value: [parser(x) for x in value.split(',')]
+
+def _option_type(value):
+    if str(value).lower() not in ('call', 'put'):
+        raise ValueError("option_type must be 'call' or 'put'")
+    return value
+
+# calc type -> (scalar function, [(field, parser, default)]). Defaults are run
+# through the parser like submitted values.
+CALCULATIONS = {
+    'stock_profit_loss': (calculate_stock_profit_loss, [
+        ('purchase_price', float, REQUIRED),
+        ('sale_price', float, REQUIRED),
+        ('quantity', int, REQUIRED),
+        ('purchase_commission', float, 0),
+        ('sale_commission', float, 0),
+    ]),
+    'position_size': (calculate_position_size, [
+        ('account_balance', float, REQUIRED),
+        ('risk_percentage', float, REQUIRED),
+        ('entry_price', float, REQUIRED),
+        ('stop_loss_price', float, REQUIRED),
+    ]),
+    'risk_reward_ratio': (calculate_risk_reward_ratio, [
+        ('entry_price', float, REQUIRED),
+        ('stop_loss_price', float, REQUIRED),
+        ('target_price', float, REQUIRED),
+    ]),
+    'breakeven_point': (calculate_breakeven_point, [
+        ('purchase_price', float, REQUIRED),
+        ('quantity', int, REQUIRED),
+        ('total_fees', float, REQUIRED),
+    ]),
+    'capital_gains_tax': (calculate_capital_gains_tax, [
+        ('profit', float, REQUIRED),
+        ('tax_rate', float, REQUIRED),
+    ]),
+    'dividend_yield': (calculate_dividend_yield, [
+        ('stock_price', float, REQUIRED),
+        ('annual_dividend_per_share', float, REQUIRED),
+    ]),
+    'investment_return': (calculate_investment_return, [
+        ('initial_investment', float, REQUIRED),
+        ('final_value', float, REQUIRED),
+    ]),
+    'cagr': (calculate_cagr, [
+        ('beginning_value', float, REQUIRED),
+        ('ending_value', float, REQUIRED),
+        ('years', int, REQUIRED),
+    ]),
+    'compound_growth': (calculate_compound_growth, [
+        ('principal', float, REQUIRED),
+        ('annual_rate', float, REQUIRED),
+        ('years', int, REQUIRED),
+        ('compounds_per_year', int, 1),
+    ]),
+    'future_value': (calculate_future_value, [
+        ('present_value', float, REQUIRED),
+        ('annual_rate', float, REQUIRED),
+        ('years', int, REQUIRED),
+    ]),
+    'present_value': (calculate_present_value, [
+        ('future_value', float, REQUIRED),
+        ('annual_rate', float, REQUIRED),
+        ('years', int, REQUIRED),
+    ]),
+    'dca': (calculate_dca, [
+        ('investment_amounts', _number_list(float), REQUIRED),
+        ('share_prices', _number_list(float), REQUIRED),
+    ]),
+    'average_price': (calculate_average_price, [
+        ('quantities', _number_list(int), REQUIRED),
+        ('prices', _number_list(float), REQUIRED),
+    ]),
+    'option_profit_loss': (calculate_option_profit_loss, [
+        ('option_type', _option_type, REQUIRED),
+        ('strike_price', float, REQUIRED),
+        ('stock_price_at_expiry', float, REQUIRED),
+        ('premium_paid', float, REQUIRED),
+        ('quantity', int, 100),
+        ('contracts', int, 1),
+    ]),
+    'total_cost': (calculate_total_cost, [
+        ('trade_value', float, REQUIRED),
+        ('commission_rate', float, 0),
+        ('fixed_fee', float, 0),
+    ]),
+}
+
+# Calculations whose inputs are per-request lists can't be stacked into one
+# array call and always run through the scalar function.
+SCALAR_ONLY = {'dca', 'average_price'}
+
+def parse_arguments(calc_type, data):
+    _, fields = CALCULATIONS[calc_type]
+    return parse_fields(fields, data)
+
+def parse_fields(fields, data):
+    arguments = []
+    for field, parser, default in fields:
+        if default is REQUIRED:
+            arguments.append(parser(data[field]))
+        else:
+            arguments.append(parser(data.get(field, default)))
+    return arguments
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -11,120 +133,259 @@ def index():
 def calculate():
     data = request.get_json()
     calc_type = data.get('type')
-    
+
+    if calc_type not in CALCULATIONS:
+        return jsonify({'error': 'Invalid calculation type'}), 400
+
     try:
-        if calc_type == 'stock_profit_loss':
-            result = calculate_stock_profit_loss(
-                float(data['purchase_price']),
-                float(data['sale_price']),
-                int(data['quantity']),
-                float(data.get('purchase_commission', 0)),
-                float(data.get('sale_commission', 0))
-            )
-        
-        elif calc_type == 'position_size':
-            result = calculate_position_size(
-                float(data['account_balance']),
-                float(data['risk_percentage']),
-                float(data['entry_price']),
-                float(data['stop_loss_price'])
-            )
-        
-        elif calc_type == 'risk_reward_ratio':
-            result = calculate_risk_reward_ratio(
-                float(data['entry_price']),
-                float(data['stop_loss_price']),
-                float(data['target_price'])
-            )
-        
-        elif calc_type == 'breakeven_point':
-            result = calculate_breakeven_point(
-                float(data['purchase_price']),
-                int(data['quantity']),
-                float(data['total_fees'])
-            )
-        
-        elif calc_type == 'capital_gains_tax':
-            result = calculate_capital_gains_tax(
-                float(data['profit']),
-                float(data['tax_rate'])
-            )
-        
-        elif calc_type == 'dividend_yield':
-            result = calculate_dividend_yield(
-                float(data['stock_price']),
-                float(data['annual_dividend_per_share'])
-            )
-        
-        elif calc_type == 'investment_return':
-            result = calculate_investment_return(
-                float(data['initial_investment']),
-                float(data['final_value'])
-            )
-        
-        elif calc_type == 'cagr':
-            result = calculate_cagr(
-                float(data['beginning_value']),
-                float(data['ending_value']),
-                int(data['years'])
-            )
-        
-        elif calc_type == 'compound_growth':
-            result = calculate_compound_growth(
-                float(data['principal']),
-                float(data['annual_rate']),
-                int(data['years']),
-                int(data.get('compounds_per_year', 1))
-            )
-        
-        elif calc_type == 'future_value':
-            result = calculate_future_value(
-                float(data['present_value']),
-                float(data['annual_rate']),
-                int(data['years'])
-            )
-        
-        elif calc_type == 'present_value':
-            result = calculate_present_value(
-                float(data['future_value']),
-                float(data['annual_rate']),
-                int(data['years'])
-            )
-        
-        elif calc_type == 'dca':
-            amounts = [float(x) for x in data['investment_amounts'].split(',')]
-            prices = [float(x) for x in data['share_prices'].split(',')]
-            result = calculate_dca(amounts, prices)
-        
-        elif calc_type == 'average_price':
-            quantities = [int(x) for x in data['quantities'].split(',')]
-            prices = [float(x) for x in data['prices'].split(',')]
-            result = calculate_average_price(quantities, prices)
-        
-        elif calc_type == 'option_profit_loss':
-            result = calculate_option_profit_loss(
-                data['option_type'],
-                float(data['strike_price']),
-                float(data['stock_price_at_expiry']),
-                float(data['premium_paid']),
-                int(data.get('quantity', 100)),
-                int(data.get('contracts', 1))
-            )
-        
-        elif calc_type == 'total_cost':
-            result = calculate_total_cost(
-                float(data['trade_value']),
-                float(data.get('commission_rate', 0)),
-                float(data.get('fixed_fee', 0))
-            )
-        
-        else:
-            return jsonify({'error': 'Invalid calculation type'}), 400
-        
-        return jsonify({'result': result})
-    
+        function, _ = CALCULATIONS[calc_type]
+        result = function(*parse_arguments(calc_type, data))
+        return jsonify({'result': _jsonable(result)})
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (np.integer, np.floating)):
+        value = value.item()
+    # inf and NaN have no JSON spelling; they go out as null.
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, (int, float, str)):
+        return value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _item_result(result, position):
+    if isinstance(result, dict):
+        return {key: float(values[position]) for key, values in result.items()}
+    return float(result[position])
+
+def _non_finite(value):
+    values = value.values() if isinstance(value, dict) else [value]
+    return any(isinstance(item, (int, float)) and not np.isfinite(item) for item in values)
+
+def _run_scalar(calc_type, arguments):
+    function, _ = CALCULATIONS[calc_type]
+    return {'result': _jsonable(function(*arguments))}
+
+def run_batch(items, stats):
+    outputs = [None] * len(items)
+    groups = {}
+    for position, data in enumerate(items):
+        try:
+            if not isinstance(data, dict):
+                raise ValueError('Each calculation must be a JSON object')
+            calc_type = data.get('type')
+            if calc_type not in CALCULATIONS:
+                raise ValueError('Invalid calculation type')
+            groups.setdefault(calc_type, []).append((position, parse_arguments(calc_type, data)))
+        except Exception as e:
+            outputs[position] = {'error': str(e)}
+
+    for calc_type, members in groups.items():
+        function, _ = CALCULATIONS[calc_type]
+        vectorized = None if calc_type in SCALAR_ONLY else getattr(Vectorized, function.__name__, None)
+        results = None
+        if vectorized is not None and len(members) > 1:
+            try:
+                columns = [np.array(column) for column in zip(*(arguments for _, arguments in members))]
+                # Non-finite results are rerun through the scalar path below.
+                with np.errstate(all='ignore'):
+                    results = vectorized(*columns)
+                stats['vectorized_groups'] += 1
+            except Exception:
+                results = None
+
+        for offset, (position, arguments) in enumerate(members):
+            try:
+                if results is None:
+                    outputs[position] = _run_scalar(calc_type, arguments)
+                    continue
+                value = _item_result(results, offset)
+                # NaN or inf marks inputs the scalar function treats specially
+                # (or rejects); rerun those so the item matches /calculate.
+                outputs[position] = _run_scalar(calc_type, arguments) if _non_finite(value) else {'result': value}
+            except Exception as e:
+                outputs[position] = {'error': str(e)}
+
+    stats['count'] += len(items)
+    stats['errors'] += sum(1 for output in outputs if 'error' in output)
+    return outputs
+
+def _new_stats():
+    return {'count': 0, 'errors': 0, 'vectorized_groups': 0}
+
+def _finish_stats(stats, started):
+    seconds = time.perf_counter() - started
+    stats['seconds'] = seconds
+    stats['per_second'] = stats['count'] / seconds if seconds > 0 else None
+    return stats
+
+def _read_ndjson(stream):
+    for raw_line in stream:
+        line = raw_line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+def _ndjson_batches(stream):
+    started = time.perf_counter()
+    stats = _new_stats()
+    chunk = []
+    position = 0
+
+    def flush():
+        nonlocal position
+        parsed = [item for item in chunk if not isinstance(item, Exception)]
+        outputs = iter(run_batch(parsed, stats))
+        for item in chunk:
+            if isinstance(item, Exception):
+                stats['count'] += 1
+                stats['errors'] += 1
+                output = {'error': f"Invalid JSON: {item}"}
+            else:
+                output = next(outputs)
+            yield json.dumps(dict(output, index=position)) + '\n'
+            position += 1
+        chunk.clear()
+
+    for item in _read_ndjson(stream):
+        chunk.append(item)
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            yield from flush()
+    yield from flush()
+    yield json.dumps({'stats': _finish_stats(stats, started)}) + '\n'
+
+@app.route('/calculate/batch', methods=['POST'])
+def calculate_batch():
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        return Response(
+            stream_with_context(_ndjson_batches(request.stream)),
+            mimetype='application/x-ndjson'
+        )
+
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        return jsonify({'error': 'Expected a JSON array of calculations or an NDJSON stream'}), 400
+
+    started = time.perf_counter()
+    stats = _new_stats()
+    results = []
+    for start in range(0, len(items), BATCH_CHUNK_SIZE):
+        results.extend(run_batch(items[start:start + BATCH_CHUNK_SIZE], stats))
+    return jsonify({'results': results, 'stats': _finish_stats(stats, started)})
+
+def _json_floats(values):
+    return [None if value != value else value for value in np.asarray(values, dtype=float).ravel().tolist()]
+
+@app.route('/options/chain', methods=['POST'])
+def price_option_chain():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object describing the option chain'}), 400
+
+    started = time.perf_counter()
+    try:
+        option_type = np.asarray(data.get('option_type', 'call'))
+        spot = np.asarray(data['spot'], dtype=float)
+        strike = np.asarray(data['strike'], dtype=float)
+        time_to_expiry = np.asarray(data['time_to_expiry'], dtype=float)
+        rate = np.asarray(data.get('rate', 0), dtype=float)
+        dividend_yield = np.asarray(data.get('dividend_yield', 0), dtype=float)
+
+        response = {}
+        if 'volatility' in data:
+            volatility = np.asarray(data['volatility'], dtype=float)
+        elif 'price' in data:
+            volatility = Options.implied_volatility(
+                option_type, data['price'], spot, strike, time_to_expiry, rate, dividend_yield
+            )
+            response['implied_volatility'] = _json_floats(volatility)
+        else:
+            raise KeyError('volatility')
+
+        greeks = Options.black_scholes_greeks(option_type, spot, strike, time_to_expiry, rate, volatility, dividend_yield)
+    except KeyError as e:
+        return jsonify({'error': f"Missing field: {e.args[0]} (give 'volatility', or market 'price' to solve for it)"}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    for name, values in greeks.items():
+        response[name] = _json_floats(values)
+    response['count'] = len(response['price'])
+    response['seconds'] = time.perf_counter() - started
+    return jsonify(response)
+
+# sim type -> (simulation function, [(field, parser, default)]); the return
+# model and its fields are parsed separately by parse_return_model.
+SIMULATIONS = {
+    'dca': (Simulation.simulate_dca, [
+        ('contribution', float, REQUIRED),
+        ('years', float, REQUIRED),
+        ('steps_per_year', int, 12),
+        ('initial_investment', float, 0),
+    ]),
+    'compound_growth': (Simulation.simulate_compound_growth, [
+        ('principal', float, REQUIRED),
+        ('years', float, REQUIRED),
+        ('compounds_per_year', int, 1),
+    ]),
+    'future_value': (Simulation.simulate_future_value, [
+        ('present_value', float, REQUIRED),
+        ('years', float, REQUIRED),
+    ]),
+}
+
+def parse_return_model(data):
+    model = data.get('model', 'gbm')
+    if model == 'gbm':
+        annual_rate = float(data.get('annual_return', data.get('annual_rate', 7)))
+        compounds_per_year = int(data.get('compounds_per_year', 1))
+        if 'annual_return' not in data and compounds_per_year > 0:
+            # Same effective yearly growth as calculate_compound_growth.
+            annual_rate = ((1 + annual_rate / 100 / compounds_per_year) ** compounds_per_year - 1) * 100
+        return Simulation.GBMReturns(annual_rate, float(data.get('volatility', 15)))
+    if model == 'bootstrap':
+        start = data.get('start') or (datetime.date.today() - datetime.timedelta(days=365 * 10)).isoformat()
+        return Simulation.bootstrap_from_store(data['ticker'].upper(), start, data.get('end'))
+    raise ValueError("model must be 'gbm' or 'bootstrap'")
+
+@app.route('/simulate', methods=['POST'])
+def simulate():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or data.get('type') not in SIMULATIONS:
+        return jsonify({'error': 'Invalid simulation type'}), 400
+
+    started = time.perf_counter()
+    try:
+        function, fields = SIMULATIONS[data['type']]
+        arguments = parse_fields(fields, data)
+        paths = int(data.get('paths', 100_000))
+        if paths > SIMULATION_MAX_PATHS:
+            raise ValueError(f"paths is limited to {SIMULATION_MAX_PATHS:,}")
+        seed = data.get('seed')
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        percentiles = [float(p) for p in data.get('percentiles', Simulation.DEFAULT_PERCENTILES)]
+
+        result = function(
+            parse_return_model(data), *arguments, percentiles=percentiles,
+            n_paths=paths, seed=int(seed), workers=SIMULATION_WORKERS
+        )
+    except KeyError as e:
+        return jsonify({'error': f"Missing field: {e.args[0]}"}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # The seed is echoed back so a distribution can be reproduced exactly.
+    result['seed'] = str(seed)
+    result['seconds'] = time.perf_counter() - started
+    return jsonify(result)
+
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
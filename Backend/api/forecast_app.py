@@ -0,0 +1,34 @@
+from flask import Flask, request, jsonify, send_file
+import Forecast
+
+app = Flask(__name__)
+
+MAX_CHART_PIXELS = 4000
+
+@app.route('/forecast/chart/<ticker>', methods=['GET'])
+def forecast_chart(ticker):
+    model = request.args.get('model', 'prophet')
+    fmt = request.args.get('format', 'png')
+    try:
+        width = int(request.args.get('width', 1600))
+        height = int(request.args.get('height', 800))
+    except ValueError:
+        return jsonify({'error': 'width and height must be integers'}), 400
+    if not (100 <= width <= MAX_CHART_PIXELS and 100 <= height <= MAX_CHART_PIXELS):
+        return jsonify({'error': f'width and height must be between 100 and {MAX_CHART_PIXELS}'}), 400
+
+    try:
+        path = Forecast.forecast_chart(ticker, model=model, fmt=fmt, width=width, height=height)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    if path is None:
+        return jsonify({'error': f'No data for ticker {ticker}'}), 404
+
+    # The file name carries the data version, so its ETag changes exactly
+    # when a new chart is rendered.
+    return send_file(path, mimetype=Forecast.CHART_FORMATS[fmt], conditional=True, etag=True, max_age=300)
+
+if __name__ == '__main__':
+    app.run(debug=True)
@@ -1,20 +1,65 @@
+import os
+
 from flask import Flask, request, jsonify
-import yfinance as yf
 import pandas as pd
 import numpy as np
+import Downsample
 import Indicators
+import Planner
+import Store
+import serializers
+from result_cache import CachedResult, ResultCache
 
 app = Flask(__name__)
 
+# Indicators drawn as bands are reduced with a min/max envelope so the band
+# never looks narrower than it is; everything else uses LTTB.
+BAND_INDICATORS = {'bollinger_bands', 'keltner_channel', 'donchian_channel'}
+MIN_POINTS = 3
+
+result_cache = ResultCache(
+    max_entries=int(os.environ.get('INDICATOR_CACHE_SIZE', 256)),
+    ttl=float(os.environ.get('INDICATOR_CACHE_TTL', 300))
+)
+
 def get_data(ticker, start, end):
     try:
-        data = yf.download(ticker, start=start, end=end)
-        if data.empty:
+        data = Store.get_ohlcv(ticker, start, end)
+        if data is None or data.empty:
             return None
         return data
     except Exception as e:
         return None
 
+def get_data_meta(ticker, start, end):
+    try:
+        return Store.get_store().refresh(ticker, start, end)
+    except Exception as e:
+        return None
+
+def parse_params(args, reserved):
+    params = {}
+    for key, value in args.items():
+        if key not in reserved:
+            try:
+                if '.' in value:
+                    params[key] = float(value)
+                else:
+                    params[key] = int(value)
+            except ValueError:
+                params[key] = value
+    return params
+
+def cache_key(indicator_name, ticker, start, end, params, version):
+    return (
+        ticker.upper(),
+        version,
+        indicator_name,
+        pd.Timestamp(start).strftime('%Y-%m-%d'),
+        pd.Timestamp(end).strftime('%Y-%m-%d'),
+        tuple(sorted((key, repr(value)) for key, value in params.items()))
+    )
+
 @app.route('/indicator/<indicator_name>', methods=['GET'])
 def calculate_indicator(indicator_name):
     ticker = request.args.get('ticker')
@@ -23,10 +68,14 @@ def calculate_indicator(indicator_name):
 
     if not ticker:
         return jsonify({"error": "Ticker symbol is required"}), 400
+    try:
+        ticker = Store.validate_ticker(ticker)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    stock_data = get_data(ticker, start_date, end_date)
+    meta = get_data_meta(ticker, start_date, end_date)
 
-    if stock_data is None:
+    if meta is None:
         return jsonify({"error": f"Could not retrieve data for ticker: {ticker}"}), 404
 
     indicator_function = getattr(Indicators, indicator_name, None)
@@ -34,31 +83,168 @@ def calculate_indicator(indicator_name):
     if not callable(indicator_function):
         return jsonify({"error": f"Indicator '{indicator_name}' not found"}), 404
 
-    params = {}
-    for key, value in request.args.items():
-        if key not in ['ticker', 'start', 'end']:
-            try:
-                if '.' in value:
-                    params[key] = float(value)
-                else:
-                    params[key] = int(value)
-            except ValueError:
-                params[key] = value
+    fmt = serializers.negotiate(request)
+
+    if fmt is None:
+        return jsonify({"error": "Unsupported format", "formats": sorted(serializers.MIMETYPES)}), 406
+
+    max_points = request.args.get('max_points')
+    if max_points is not None:
+        try:
+            max_points = int(max_points)
+        except ValueError:
+            max_points = 0
+        if max_points < MIN_POINTS:
+            return jsonify({"error": f"max_points must be an integer of at least {MIN_POINTS}"}), 400
+
+    params = parse_params(request.args, ['ticker', 'start', 'end', 'format', 'max_points'])
 
     try:
-        result = indicator_function(stock_data, **params)
+        key = cache_key(indicator_name, ticker, start_date, end_date, params, meta['version'])
+    except ValueError as e:
+        return jsonify({"error": f"Invalid date range: {str(e)}"}), 400
 
-        if isinstance(result, (pd.DataFrame, pd.Series)):
-            json_result = result.to_json(orient='split', date_format='iso')
-        elif isinstance(result, dict):
-            json_result = jsonify(result)
-        else:
-             json_result = jsonify(str(result))
+    cached = result_cache.get(key)
+    if cached is not None:
+        return indicator_response(cached, fmt, indicator_name, max_points)
+
+    stock_data = get_data(ticker, start_date, end_date)
 
-        return json_result
+    if stock_data is None:
+        return jsonify({"error": f"Could not retrieve data for ticker: {ticker}"}), 404
 
+    try:
+        result = indicator_function(stock_data, **params)
     except Exception as e:
         return jsonify({"error": f"Error calculating indicator: {str(e)}"}), 500
 
+    # A new data version makes every older entry for this ticker unreachable.
+    result_cache.invalidate(lambda cached_key: cached_key[0] == key[0] and cached_key[1] != key[1])
+    last_modified = pd.Timestamp(meta['updated']).to_pydatetime()
+    cached = result_cache.put(key, CachedResult(result, ResultCache.make_etag(key), last_modified))
+    return indicator_response(cached, fmt, indicator_name, max_points)
+
+def indicator_response(cached, fmt, indicator_name=None, max_points=None):
+    result = cached.value
+    if not isinstance(result, (pd.DataFrame, pd.Series)):
+        response = jsonify(result if isinstance(result, dict) else str(result))
+        return cached.to_response(request, response.get_data(), response.mimetype)
+
+    variant = fmt
+    try:
+        if max_points is not None and len(result) > max_points:
+            # The cache keeps the full-resolution result; only the response
+            # is reduced.
+            method = 'minmax' if indicator_name in BAND_INDICATORS else 'lttb'
+            result = Downsample.downsample(result, max_points, method=method)
+            variant = f"{fmt}-{method}{max_points}"
+        chunks, mimetype = serializers.serialize(result, fmt)
+        if len(result) <= serializers.CHUNK_ROWS:
+            chunks = [chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in chunks]
+            chunks = b''.join(chunks)
+    except Exception as e:
+        return jsonify({"error": f"Error serializing indicator: {str(e)}"}), 500
+    return cached.to_response(request, chunks, mimetype, variant=variant)
+
+def _json_values(values):
+    series = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return [None if pd.isna(value) else value.isoformat() for value in series]
+    if pd.api.types.is_float_dtype(series):
+        # inf/-inf (e.g. a ratio over a zero denominator) isn't valid JSON either.
+        return series.astype(object).where(np.isfinite(series), None).tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+def _json_index(index):
+    if isinstance(index, pd.DatetimeIndex):
+        return [value.isoformat() for value in index]
+    return [str(value) for value in index]
+
+def columnar_result(result, index):
+    if isinstance(result, pd.Series):
+        result = result.to_frame(name='value')
+    if isinstance(result, pd.DataFrame):
+        payload = {'columns': {str(column): _json_values(result[column]) for column in result.columns}}
+        if not result.index.equals(index):
+            payload['index'] = _json_index(result.index)
+        return payload
+    if isinstance(result, dict):
+        return {'value': {key: None if pd.isna(value) or not np.isfinite(float(value)) else float(value) for key, value in result.items()}}
+    return {'value': str(result)}
+
+@app.route('/indicators/batch', methods=['POST'])
+def calculate_indicator_batch():
+    payload = request.get_json(silent=True) or {}
+    ticker = payload.get('ticker')
+    start_date = payload.get('start', '2023-01-01')
+    end_date = payload.get('end', pd.to_datetime('today').strftime('%Y-%m-%d'))
+    specs = payload.get('indicators')
+
+    if not ticker:
+        return jsonify({"error": "Ticker symbol is required"}), 400
+    try:
+        ticker = Store.validate_ticker(ticker)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not isinstance(specs, list) or not specs:
+        return jsonify({"error": "A non-empty 'indicators' list is required"}), 400
+
+    specs = [{'name': spec} if isinstance(spec, str) else spec for spec in specs]
+    for position, spec in enumerate(specs):
+        if not isinstance(spec, dict) or not spec.get('name'):
+            return jsonify({"error": f"Indicator spec at position {position} needs a 'name'"}), 400
+    # Explicit ids must be unique; entries without one are labelled by name,
+    # with a suffix that doesn't clash with any id or earlier label.
+    ids = [str(spec['id']) for spec in specs if 'id' in spec]
+    duplicates = sorted({label for label in ids if ids.count(label) > 1})
+    if duplicates:
+        return jsonify({"error": f"Duplicate indicator ids: {', '.join(duplicates)}"}), 400
+    taken = set(ids)
+
+    labels, requests = [], []
+    for position, spec in enumerate(specs):
+        if 'id' in spec:
+            label = str(spec['id'])
+        else:
+            label, suffix = str(spec['name']), position
+            while label in taken:
+                label = f"{spec['name']}_{suffix}"
+                suffix += 1
+            taken.add(label)
+        params = spec.get('params') or {}
+        if not isinstance(params, dict) or not all(
+                value is None or isinstance(value, (str, int, float, bool)) for value in params.values()):
+            return jsonify({"error": f"'params' at position {position} must be an object of scalar values"}), 400
+        labels.append(label)
+        requests.append((spec['name'], params))
+
+    stock_data = get_data(ticker, start_date, end_date)
+
+    if stock_data is None:
+        return jsonify({"error": f"Could not retrieve data for ticker: {ticker}"}), 404
+
+    results = Planner.IndicatorPlan(requests).run(stock_data, return_exceptions=True)
+
+    indicators = {}
+    for label, (name, params), result in zip(labels, requests, results):
+        entry = {'name': name, 'params': params}
+        try:
+            if isinstance(result, Exception):
+                raise result
+            entry.update(columnar_result(result, stock_data.index))
+        except Exception as e:
+            entry['error'] = f"Error calculating indicator: {str(e)}"
+        indicators[label] = entry
+
+    return jsonify({
+        'ticker': ticker.upper(),
+        'index': _json_index(stock_data.index),
+        'indicators': indicators
+    })
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(result_cache.stats())
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,32 @@
+import os
+
+from flask import Flask, request, jsonify
+import Store
+import SymbolIndex
+
+app = Flask(__name__)
+
+MAX_LIMIT = 50
+INDEX_CHECK_SECONDS = float(os.environ.get('SYMBOL_INDEX_CHECK_SECONDS', 60))
+
+@app.route('/search', methods=['GET'])
+def search():
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_LIMIT:
+        return jsonify({'error': f'limit must be an integer between 1 and {MAX_LIMIT}'}), 400
+    fuzzy = request.args.get('fuzzy', 'true').lower() not in ('0', 'false', 'no')
+
+    index = SymbolIndex.get_index(store_root=Store.get_store().root, check_every=INDEX_CHECK_SECONDS)
+    response = jsonify({'query': query, 'results': index.search(query, limit=limit, fuzzy=fuzzy)})
+    # Results only change when the universe does, so browsers may reuse them briefly.
+    response.cache_control.max_age = 60
+    return response
+
+if __name__ == '__main__':
+    app.run(debug=True)
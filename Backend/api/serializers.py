@@ -0,0 +1,144 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+
+# Decimal places kept in text output, matching the DataFrame.to_json default.
+JSON_DECIMALS = 10
+
+MIMETYPES = {
+    'json': 'application/json',
+    'columnar': 'application/vnd.stockenplace.columnar+json',
+    'msgpack': 'application/msgpack',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+_ALIASES = {
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.apache.arrow.file': 'arrow',
+}
+
+def negotiate(request):
+    requested = request.args.get('format')
+    if requested:
+        return requested if requested in MIMETYPES else None
+    offers = list(MIMETYPES.values()) + list(_ALIASES)
+    best = request.accept_mimetypes.best_match(offers, default=MIMETYPES['json'])
+    if best is None:
+        return None
+    return _ALIASES.get(best) or next(name for name, mimetype in MIMETYPES.items() if mimetype == best)
+
+def _as_frame(result):
+    if isinstance(result, pd.Series):
+        return result.to_frame(name=result.name if result.name is not None else 'value')
+    return result
+
+def _epoch_ms(index):
+    if isinstance(index, pd.DatetimeIndex):
+        return 'timestamp[ms]', (index.asi8 // 1_000_000)
+    return 'string', np.array([str(value) for value in index], dtype=object)
+
+def _column_type(values):
+    if values.dtype.kind == 'f':
+        return 'float64', values.astype(np.float64, copy=False)
+    if values.dtype.kind in 'iu':
+        return 'int64', values.astype(np.int64, copy=False)
+    if values.dtype.kind == 'b':
+        return 'bool', values
+    return 'string', np.array([None if pd.isna(value) else str(value) for value in values], dtype=object)
+
+def _json_array(values):
+    if values.dtype.kind in 'fiub':
+        # pandas' C encoder writes NaN as null and is far faster than json.dumps.
+        return pd.Series(values, copy=False).to_json(orient='values', double_precision=JSON_DECIMALS)
+    return json.dumps(values.tolist())
+
+def to_legacy_json(result):
+    return [result.to_json(orient='split', date_format='iso')]
+
+def to_columnar_json(result, chunk_rows=CHUNK_ROWS):
+    frame = _as_frame(result)
+    index_type, index_values = _epoch_ms(frame.index)
+    yield '{"length":%d,"index":{"type":"%s","data":' % (len(frame), index_type)
+    yield from _json_chunks(index_values, chunk_rows)
+    yield '},"columns":['
+    for position, name in enumerate(frame.columns):
+        column_type, values = _column_type(frame[name].to_numpy())
+        prefix = ',' if position else ''
+        yield f'{prefix}{{"name":{json.dumps(str(name))},"type":"{column_type}","data":'
+        yield from _json_chunks(values, chunk_rows)
+        yield '}'
+    yield ']}'
+
+def _json_chunks(values, chunk_rows):
+    if len(values) <= chunk_rows:
+        yield _json_array(values)
+        return
+    yield '['
+    for start in range(0, len(values), chunk_rows):
+        chunk = _json_array(values[start:start + chunk_rows])[1:-1]
+        yield chunk if start == 0 else ',' + chunk
+    yield ']'
+
+def _msgpack_bin_header(size):
+    # msgpack's Packer has array and map headers but no bin header.
+    if size < 1 << 8:
+        return b'\xc4' + size.to_bytes(1, 'big')
+    if size < 1 << 16:
+        return b'\xc5' + size.to_bytes(2, 'big')
+    return b'\xc6' + size.to_bytes(4, 'big')
+
+def to_msgpack(result, chunk_rows=CHUNK_ROWS):
+    import msgpack
+
+    frame = _as_frame(result)
+    index_type, index_values = _epoch_ms(frame.index)
+    packer = msgpack.Packer(use_bin_type=True)
+
+    def packed(kind, values):
+        # Fixed-width columns travel as raw little-endian buffers. A bin or
+        # array header declares the full length up front, so the body can
+        # follow in slices of `chunk_rows` and decode as one value.
+        if kind in ('float64', 'int64', 'timestamp[ms]', 'bool'):
+            values = values.astype(np.uint8) if kind == 'bool' else values.astype(values.dtype.newbyteorder('<'), copy=False)
+            yield _msgpack_bin_header(values.nbytes)
+            for start in range(0, len(values), chunk_rows):
+                yield values[start:start + chunk_rows].tobytes()
+            return
+        yield packer.pack_array_header(len(values))
+        for start in range(0, len(values), chunk_rows):
+            yield b''.join(packer.pack(value) for value in values[start:start + chunk_rows].tolist())
+
+    yield packer.pack_map_header(3) + packer.pack('length') + packer.pack(len(frame))
+    yield packer.pack('index') + packer.pack_map_header(2) + packer.pack('type') + packer.pack(index_type) + packer.pack('data')
+    yield from packed(index_type, index_values)
+    yield packer.pack('columns') + packer.pack_array_header(len(frame.columns))
+    for name in frame.columns:
+        column_type, values = _column_type(frame[name].to_numpy())
+        yield (packer.pack_map_header(3) + packer.pack('name') + packer.pack(str(name))
+               + packer.pack('type') + packer.pack(column_type) + packer.pack('data'))
+        yield from packed(column_type, values)
+
+def to_arrow(result, chunk_rows=CHUNK_ROWS):
+    import pyarrow as pa
+
+    frame = _as_frame(result)
+    frame = frame.rename(columns=str)
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    yield table.schema.serialize().to_pybytes()
+    for batch in table.to_batches(max_chunksize=chunk_rows):
+        yield batch.serialize().to_pybytes()
+    # End-of-stream marker: continuation token followed by a zero length.
+    yield b'\xff\xff\xff\xff\x00\x00\x00\x00'
+
+SERIALIZERS = {
+    'json': lambda result, chunk_rows=CHUNK_ROWS: to_legacy_json(result),
+    'columnar': to_columnar_json,
+    'msgpack': to_msgpack,
+    'arrow': to_arrow,
+}
+
+def serialize(result, fmt, chunk_rows=CHUNK_ROWS):
+    return SERIALIZERS[fmt](result, chunk_rows=chunk_rows), MIMETYPES[fmt]
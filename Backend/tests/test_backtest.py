@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Forecasts'))
+
+import Backtest
+import Forecast
+
+
+def test_make_folds_expanding():
+    # The last test window ends exactly at the final row.
+    assert Backtest.make_folds(100, horizon=10, initial_train=50, step=20) == [(0, 50), (0, 70), (0, 90)]
+    assert Backtest.make_folds(99, horizon=10, initial_train=50, step=20) == [(0, 50), (0, 70)]
+
+def test_make_folds_window_and_max_folds():
+    assert Backtest.make_folds(100, horizon=10, initial_train=50, step=20, window=60) == [(0, 50), (10, 70), (30, 90)]
+    assert Backtest.make_folds(100, horizon=10, initial_train=50, step=20, max_folds=2) == [(0, 70), (0, 90)]
+
+def test_make_folds_too_short():
+    assert Backtest.make_folds(59, horizon=10, initial_train=50, step=20) == []
+
+
+def record(last, actual, predicted=None, error=None):
+    found = {'origin': 0, 'last': last, 'actual': actual, 'seconds': 0.0}
+    if error is None:
+        found['predicted'] = predicted
+    else:
+        found['error'] = error
+    return found
+
+def test_score():
+    scores = Backtest.score([
+        record(10.0, [11.0, 9.0], [12.0, 12.0]),
+        record(10.0, [8.0, 10.0], [9.0, 10.0]),
+        record(10.0, [10.0], error='ValueError: boom'),
+    ])
+    assert (scores['folds'], scores['failed']) == (2, 1)
+    errors = np.array([1.0, 3.0, 1.0, 0.0])
+    assert scores['rmse'] == pytest.approx(np.sqrt(np.mean(errors ** 2)))
+    assert scores['mape'] == pytest.approx(np.mean(errors / [11.0, 9.0, 8.0, 10.0]) * 100)
+    # Calls: up/right, up/wrong, down/right; the flat prediction isn't a call.
+    assert scores['direction_accuracy'] == pytest.approx(200 / 3)
+    assert scores['flat_calls'] == pytest.approx(25.0)
+
+def test_score_naive_makes_no_calls():
+    scores = Backtest.score([record(10.0, [11.0, 9.0], [10.0, 10.0])])
+    assert np.isnan(scores['direction_accuracy'])
+    assert scores['flat_calls'] == 100.0
+
+def test_score_all_failed():
+    scores = Backtest.score([record(10.0, [10.0], error='ValueError: boom')])
+    assert (scores['folds'], scores['failed']) == (0, 1)
+    assert np.isnan(scores['rmse'])
+
+
+def test_walk_forward_reuses_cached_folds(tmp_path, monkeypatch):
+    index = pd.bdate_range('2020-01-01', periods=120, name='Date')
+    data = pd.DataFrame({'Close': 100 + np.sin(np.arange(120) / 3)}, index=index)
+    monkeypatch.setattr(Forecast, 'get_stock_data', lambda ticker, years=10: data)
+    options = dict(models=('naive',), horizon=10, initial_train=60, step=20, workers=1, cache_dir=str(tmp_path))
+
+    first, _ = Backtest.walk_forward(['aapl'], **options)
+    second, _ = Backtest.walk_forward(['AAPL'], **options)
+    assert first.loc[0, 'folds'] == 3
+    assert (first.loc[0, 'cached_folds'], second.loc[0, 'cached_folds']) == (0, 3)
+    columns = ['folds', 'failed', 'rmse', 'mape', 'flat_calls']
+    pd.testing.assert_frame_equal(first[columns], second[columns])
@@ -0,0 +1,192 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Indicators'))
+
+import Indicators
+
+# The implementations the NumPy kernels replaced, kept verbatim (apart from
+# the names) as the reference the rewrites must reproduce.
+
+def baseline_average_true_range(data, period=14):
+    high = data['high']
+    low = data['low']
+    close = data['close']
+
+    tr1 = abs(high - low)
+    tr2 = abs(high - close.shift())
+    tr3 = abs(low - close.shift())
+
+    true_range = pd.DataFrame({'tr1': tr1, 'tr2': tr2, 'tr3': tr3}).max(axis=1)
+    atr = true_range.ewm(span=period, adjust=False).mean()
+    return atr
+
+def baseline_supertrend(data, atr_period=10, multiplier=3.0):
+    high = data['high']
+    low = data['low']
+    close = data['close']
+
+    atr = baseline_average_true_range(data, period=atr_period)
+
+    basic_upper_band = (high + low) / 2 + multiplier * atr
+    basic_lower_band = (high + low) / 2 - multiplier * atr
+
+    final_upper_band = basic_upper_band.copy()
+    final_lower_band = basic_lower_band.copy()
+
+    for i in range(1, len(data)):
+        if close.iloc[i-1] <= final_upper_band.iloc[i-1]:
+            final_upper_band.iloc[i] = min(basic_upper_band.iloc[i], final_upper_band.iloc[i-1])
+        if close.iloc[i-1] >= final_lower_band.iloc[i-1]:
+            final_lower_band.iloc[i] = max(basic_lower_band.iloc[i], final_lower_band.iloc[i-1])
+
+    supertrend = pd.Series(np.nan, index=data.index)
+    if len(data) > 0:
+        if close.iloc[0] > final_lower_band.iloc[0]:
+             supertrend.iloc[0] = final_lower_band.iloc[0]
+        else:
+             supertrend.iloc[0] = final_upper_band.iloc[0]
+
+    for i in range(1, len(data)):
+        if supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and close.iloc[i] <= final_upper_band.iloc[i]:
+            supertrend.iloc[i] = final_upper_band.iloc[i]
+        elif supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and close.iloc[i] > final_upper_band.iloc[i]:
+            supertrend.iloc[i] = final_lower_band.iloc[i]
+        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and close.iloc[i] >= final_lower_band.iloc[i]:
+            supertrend.iloc[i] = final_lower_band.iloc[i]
+        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and close.iloc[i] < final_lower_band.iloc[i]:
+            supertrend.iloc[i] = final_upper_band.iloc[i]
+
+    return pd.DataFrame({'supertrend': supertrend, 'final_upper': final_upper_band, 'final_lower': final_lower_band})
+
+def baseline_parabolic_sar(data, initial_af=0.02, max_af=0.2, increment=0.02):
+    high, low = data['high'], data['low']
+    psar = low.copy()
+    bull = True
+    af = initial_af
+    ep = high[0]
+
+    for i in range(2, len(data)):
+        if bull:
+            psar[i] = psar[i-1] + af * (ep - psar[i-1])
+        else:
+            psar[i] = psar[i-1] - af * (psar[i-1] - ep)
+
+        reverse = False
+        if bull:
+            if low[i] < psar[i]:
+                bull = False
+                reverse = True
+                psar[i] = ep
+                ep = low[i]
+                af = initial_af
+        else:
+            if high[i] > psar[i]:
+                bull = True
+                reverse = True
+                psar[i] = ep
+                ep = high[i]
+                af = initial_af
+
+        if not reverse:
+            if bull:
+                if high[i] > ep:
+                    ep = high[i]
+                    af = min(af + increment, max_af)
+            else:
+                if low[i] < ep:
+                    ep = low[i]
+                    af = min(af + increment, max_af)
+    return psar
+
+def baseline_aroon_oscillator(data, period=25):
+    high = data['high']
+    low = data['low']
+
+    aroon_up = 100 * high.rolling(period + 1).apply(lambda x: x.argmax(), raw=True) / period
+    aroon_down = 100 * low.rolling(period + 1).apply(lambda x: x.argmin(), raw=True) / period
+
+    return aroon_up - aroon_down
+
+def baseline_commodity_channel_index(data, period=20):
+    typical_price = (data['high'] + data['low'] + data['close']) / 3
+    sma_tp = typical_price.rolling(window=period).mean()
+    mean_dev = typical_price.rolling(window=period).apply(lambda x: np.mean(np.abs(x - x.mean())))
+
+    cci = (typical_price - sma_tp) / (0.015 * mean_dev)
+    return cci
+
+
+def make_ohlc(n_rows, seed=0, gaps=False, flat=False):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows)))
+    if flat:
+        # Repeated prices produce ties for the rolling argmax/argmin.
+        close = np.round(close / 5) * 5
+    spread = np.abs(rng.normal(0, 1, n_rows))
+    data = pd.DataFrame({
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 10_000, n_rows).astype(float),
+    })
+    if gaps and n_rows:
+        # Scattered missing values plus a run of missing bars.
+        for column in ('high', 'low', 'close'):
+            data.loc[rng.random(n_rows) < 0.05, column] = np.nan
+        data.iloc[n_rows // 2:n_rows // 2 + 5, :] = np.nan
+    return data
+
+CASES = {
+    'clean': dict(n_rows=300),
+    'gaps': dict(n_rows=300, gaps=True),
+    'flat': dict(n_rows=300, flat=True),
+    'flat_gaps': dict(n_rows=300, flat=True, gaps=True),
+    'short': dict(n_rows=3),
+    'single': dict(n_rows=1),
+}
+
+@pytest.fixture(params=list(CASES), ids=list(CASES))
+def data(request):
+    return make_ohlc(**CASES[request.param])
+
+@pytest.fixture
+def dated(data):
+    return data.set_index(pd.bdate_range('2020-01-01', periods=len(data), name='Date'))
+
+
+@pytest.mark.parametrize('atr_period, multiplier', [(10, 3.0), (3, 1.5)])
+def test_supertrend_matches_baseline(dated, atr_period, multiplier):
+    expected = baseline_supertrend(dated, atr_period, multiplier)
+    result = Indicators.supertrend(dated, atr_period, multiplier)
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+def test_supertrend_empty():
+    empty = make_ohlc(0)
+    assert Indicators.supertrend(empty).empty
+
+@pytest.mark.parametrize('initial_af, max_af, increment', [(0.02, 0.2, 0.02), (0.05, 0.5, 0.05)])
+def test_parabolic_sar_matches_baseline(data, initial_af, max_af, increment):
+    # The baseline indexes positionally with [], so it runs on a RangeIndex.
+    expected = baseline_parabolic_sar(data, initial_af, max_af, increment)
+    result = Indicators.parabolic_sar(data, initial_af, max_af, increment)
+    pd.testing.assert_series_equal(result, expected, check_exact=True)
+
+@pytest.mark.parametrize('period', [5, 25])
+def test_aroon_oscillator_matches_baseline(data, period):
+    pd.testing.assert_series_equal(
+        Indicators.aroon_oscillator(data, period), baseline_aroon_oscillator(data, period), check_exact=True
+    )
+
+@pytest.mark.parametrize('period', [5, 20])
+def test_commodity_channel_index_matches_baseline(data, period):
+    # Mean absolute deviation is accumulated differently, so allow rounding.
+    pd.testing.assert_series_equal(
+        Indicators.commodity_channel_index(data, period), baseline_commodity_channel_index(data, period),
+        check_exact=False, rtol=1e-9, atol=1e-9, check_names=False
+    )
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Forecasts'))
+
+import ModelStore
+
+
+def make_series(n, start='2020-01-01'):
+    index = pd.bdate_range(start, periods=n, name='Date')
+    return pd.Series(100 + np.sin(np.arange(n) / 5), index=index)
+
+class Calls:
+    # Stand-in model functions that record what the store asked for.
+    def __init__(self):
+        self.searched = 0
+        self.updated = 0
+
+    def search(self, series):
+        self.searched += 1
+        return {'rows': len(series)}
+
+    def update(self, model, series, new):
+        self.updated += 1
+        return {'rows': len(series)}
+
+    def predict_interval(self, model, new):
+        return np.full(len(new), -np.inf), np.full(len(new), np.inf)
+
+    def fit(self, store, series, **options):
+        return store.fit('aapl', 'test', {'p': 1}, series, self.search, self.update, self.predict_interval, **options)
+
+
+def test_save_load_round_trip(tmp_path):
+    store = ModelStore.ModelStore(str(tmp_path))
+    store.save('AAPL', 'test', {'p': 1}, {'weights': [1, 2]}, {'rows': 3})
+    model, meta = store.load('aapl', 'test', {'p': 1})
+    assert model == {'weights': [1, 2]}
+    assert meta == {'rows': 3}
+    assert store.load('aapl', 'test', {'p': 2}) == (None, None)
+
+def test_text_serializer_round_trip(tmp_path):
+    store = ModelStore.ModelStore(str(tmp_path))
+    calls = Calls()
+    options = dict(dumps=lambda model: str(model['rows']).encode(), loads=lambda payload: {'rows': int(payload.decode())})
+    series = make_series(300)
+    assert calls.fit(store, series, **options) == ({'rows': 300}, 'searched')
+    assert calls.fit(store, series, **options) == ({'rows': 300}, 'reused')
+
+def test_prophet_serializers_round_trip(tmp_path):
+    prophet = pytest.importorskip('prophet')
+    series = make_series(60)
+    try:
+        model = prophet.Prophet().fit(pd.DataFrame({'ds': series.index, 'y': series.to_numpy()}))
+    except Exception as e:
+        pytest.skip(f"Prophet can't fit here: {e}")
+    store = ModelStore.ModelStore(str(tmp_path))
+    store.save('AAPL', 'prophet', {}, model, {'rows': 60}, dumps=ModelStore.prophet_dumps)
+    loaded, _ = store.load('AAPL', 'prophet', {}, loads=ModelStore.prophet_loads)
+    assert np.allclose(loaded.params['k'], model.params['k'])
+
+def test_fit_reuses_updates_and_searches(tmp_path):
+    store = ModelStore.ModelStore(str(tmp_path))
+    calls = Calls()
+    series = make_series(400)
+
+    assert calls.fit(store, series.iloc[:390])[1] == 'searched'
+    assert calls.fit(store, series.iloc[:390])[1] == 'reused'
+    assert calls.fit(store, series)[1] == 'updated'
+    # Only the start of the window moved: nothing new to update with.
+    assert calls.fit(store, series.iloc[5:])[1] == 'reused'
+    assert (calls.searched, calls.updated) == (1, 1)
+
+    # History that doesn't extend the stored fit forces a new search.
+    changed = series.copy()
+    changed.iloc[-1] += 1
+    assert calls.fit(store, pd.concat([changed, make_series(5, '2022-01-03')]))[1] == 'searched'
+    assert calls.searched == 2
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Indicators'))
+
+import Indicators
+import Panel
+
+INDICATORS = [
+    'moving_average',
+    'exponential_moving_average',
+    'relative_strength_index',
+    'bollinger_bands',
+    'average_true_range',
+    'stochastic_oscillator',
+    'on_balance_volume',
+]
+TICKERS = ['AAPL', 'LOW', 'MSFT']
+
+def yfinance_frame(group_by_ticker=False, n_bars=120, seed=0):
+    # Shaped like yf.download(tickers, auto_adjust=False): a (Price, Ticker)
+    # MultiIndex with an "Adj Close" field, or (Ticker, Price) when grouped
+    # by ticker.
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2020-01-01', periods=n_bars, name='Date')
+    columns = {}
+    for ticker in TICKERS:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+        spread = close * rng.uniform(0.001, 0.02, n_bars)
+        fields = {
+            'Adj Close': close * 0.98,
+            'Close': close,
+            'High': close + spread,
+            'Low': close - spread,
+            'Open': close + rng.normal(0, 0.5, n_bars) * spread,
+            'Volume': rng.integers(1_000, 1_000_000, n_bars).astype(float),
+        }
+        for field, values in fields.items():
+            columns[(ticker, field) if group_by_ticker else (field, ticker)] = values
+    frame = pd.DataFrame(columns, index=index)
+    frame.columns.names = ['Ticker', 'Price'] if group_by_ticker else ['Price', 'Ticker']
+    return frame
+
+def single_ticker(frame, ticker):
+    return frame.xs(ticker, axis=1, level='Ticker').rename(columns=str.lower)
+
+
+@pytest.mark.parametrize('group_by_ticker', [False, True])
+@pytest.mark.parametrize('name', INDICATORS)
+def test_yfinance_frame_matches_single_ticker(name, group_by_ticker):
+    frame = yfinance_frame(group_by_ticker)
+    result = getattr(Panel, name)(frame)
+    for ticker in TICKERS:
+        expected = getattr(Indicators, name)(single_ticker(frame, ticker))
+        if isinstance(expected, pd.DataFrame):
+            actual = pd.DataFrame({column: result[column][ticker] for column in expected.columns})
+            pd.testing.assert_frame_equal(actual, expected, check_names=False, check_freq=False)
+        else:
+            pd.testing.assert_series_equal(result[ticker], expected, check_names=False, check_freq=False)
+
+def test_explicit_level():
+    frame = yfinance_frame()
+    pd.testing.assert_frame_equal(
+        Panel.moving_average(frame, level='Price'),
+        Panel.moving_average(frame),
+    )
+
+def test_missing_field_level_raises():
+    frame = yfinance_frame().drop(columns='Close', level='Price')
+    with pytest.raises(ValueError, match='level='):
+        Panel.moving_average(frame)
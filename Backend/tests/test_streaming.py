@@ -0,0 +1,57 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Indicators'))
+
+import Indicators
+import Streaming
+from test_indicator_equivalence import CASES, make_ohlc
+
+# (state factory, batch function) pairs; each state fed bar by bar must
+# reproduce the batch indicator exactly.
+STATES = {
+    'ema': (lambda: Streaming.EMAState(period=10), lambda data: Indicators.exponential_moving_average(data, period=10)),
+    'rsi': (lambda: Streaming.RSIState(period=14), lambda data: Indicators.relative_strength_index(data, period=14)),
+    'atr': (lambda: Streaming.ATRState(period=14), lambda data: Indicators.average_true_range(data, period=14)),
+    'macd': (Streaming.MACDState, Indicators.moving_average_convergence_divergence),
+    'obv': (Streaming.OBVState, Indicators.on_balance_volume),
+    'vwap': (Streaming.VWAPState, Indicators.volume_weighted_average_price),
+    'ad_line': (Streaming.ADLineState, Indicators.accumulation_distribution_line),
+}
+
+def stream(state, data):
+    values = [state.update(bar) for bar in Streaming._rows(data, data.columns)]
+    if values and isinstance(values[0], dict):
+        return pd.DataFrame(values, index=data.index)
+    return pd.Series(values, index=data.index, dtype=float)
+
+@pytest.fixture(params=list(CASES), ids=list(CASES))
+def data(request):
+    return make_ohlc(**CASES[request.param])
+
+
+@pytest.mark.parametrize('name', list(STATES))
+def test_streaming_matches_batch(data, name):
+    make_state, batch = STATES[name]
+    expected = batch(data)
+    result = stream(make_state(), data)
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    else:
+        pd.testing.assert_series_equal(result, expected, check_exact=True, check_names=False)
+
+@pytest.mark.parametrize('name', list(STATES))
+def test_seeded_state_continues_like_batch(name):
+    data = make_ohlc(300, gaps=True)
+    make_state, batch = STATES[name]
+    state = make_state().seed(data.iloc[:200])
+    tail = stream(state, data.iloc[200:])
+    expected = batch(data).iloc[200:]
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(tail, expected, check_exact=True)
+    else:
+        pd.testing.assert_series_equal(tail, expected, check_exact=True, check_names=False)